@@ -38,7 +38,11 @@ class Settings:
         
         self.invite_link: str = "https://discord.gg/wRCgB7vBQv"
         self.nodes: Dict[str, Dict[str, Union[str, int, bool]]] = settings.get("nodes", {})
+        self.node_algorithm: str = settings.get("node_algorithm", "BY_LOAD")
+        self.search_cache: Dict[str, int] = settings.get("search_cache", {})
         self.max_queue: int = settings.get("default_max_queue", 1000)
+        self.max_history: int = settings.get("default_max_history", 0)
+        self.max_spilled_history: int = settings.get("default_max_spilled_history", 1000)
         self.bot_prefix: str = settings.get("prefix", "")
         self.activity: List[Dict[str, str]] = settings.get("activity", [{"listen": "/help"}])
         self.logging: Dict[Union[str, Dict[str, Union[str, bool]]]] = settings.get("logging", {})
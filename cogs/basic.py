@@ -24,6 +24,7 @@ SOFTWARE.
 import discord, voicelink, re
 
 from io import StringIO
+from math import inf, isinf
 from discord import app_commands
 from discord.ext import commands
 from function import (
@@ -51,7 +52,12 @@ async def nowplay(ctx: commands.Context, player: voicelink.Player):
         return await send(ctx, 'noTrackPlaying', ephemeral=True)
 
     texts = await get_lang(ctx.guild.id, "nowplayingDesc", "nowplayingField", "nowplayingLink")
-    upnext = "\n".join(f"`{index}.` `[{track.formatted_length}]` [{truncate_string(track.title)}]({track.uri})" for index, track in enumerate(player.queue.tracks()[:2], start=2))
+    remaining = inf if track.is_stream else track.length - player.position
+    upnext = "\n".join(
+        f"`{index}.` `[{upcoming.formatted_length}]` [{truncate_string(upcoming.title)}]({upcoming.uri})"
+        + ("" if isinf(eta := remaining + player.queue.time_until(index - 1)) else f" 🕒 {ctime(eta)}")
+        for index, upcoming in enumerate(player.queue.iter_tracks(stop=2), start=2)
+    )
     
     embed = discord.Embed(description=texts[0].format(track.title), color=settings.embed_color)
     embed.set_author(
@@ -96,8 +102,8 @@ class Basic(commands.Cog):
             tracks: list[voicelink.Track] = await node.get_tracks(current, requester=interaction.user, search_type=SearchType.SPOTIFY)
             return [app_commands.Choice(name=truncate_string(f"🎵 {track.author} - {track.title}", 100), value=truncate_string(f"{track.author} - {track.title}", 100)) for track in tracks] if tracks else []
         
-        history = {track["identifier"]: track for track_id in reversed(await get_user(interaction.user.id, "history")) if (track := voicelink.decode(track_id))["uri"]}
-        return [app_commands.Choice(name=truncate_string(f"🕒 {track['author']} - {track['title']}", 100), value=track['uri']) for track in history.values() if len(track['uri']) <= 100][:25]
+        history = {track.identifier: track for track in map(voicelink.LazyTrack, reversed(await get_user(interaction.user.id, "history"))) if track.uri}
+        return [app_commands.Choice(name=truncate_string(f"🕒 {track.author} - {track.title}", 100), value=track.uri) for track in history.values() if len(track.uri) <= 100][:25]
             
     @commands.hybrid_command(name="connect", aliases=get_aliases("connect"))
     @app_commands.describe(channel="Provide a channel to connect.")
@@ -131,7 +137,7 @@ class Basic(commands.Cog):
         if ctx.interaction:
             await ctx.interaction.response.defer()
 
-        tracks = await player.get_tracks(query, requester=ctx.author)
+        tracks = await player.get_tracks(query, requester=ctx.author, limit=max(player.queue.space, 1))
         if not tracks:
             return await send(ctx, "noTrackFound")
 
@@ -179,7 +185,7 @@ class Basic(commands.Cog):
             return await send(interaction, "notInChannel", interaction.user.mention, player.channel.mention, ephemeral=True)
 
         await interaction.response.defer()
-        tracks = await player.get_tracks(query, requester=interaction.user)
+        tracks = await player.get_tracks(query, requester=interaction.user, limit=max(player.queue.space, 1))
         if not tracks:
             return await send(interaction, "noTrackFound")
 
@@ -269,7 +275,7 @@ class Basic(commands.Cog):
         if ctx.interaction:
             await ctx.interaction.response.defer()
 
-        tracks = await player.get_tracks(query, requester=ctx.author)
+        tracks = await player.get_tracks(query, requester=ctx.author, limit=max(player.queue.space, 1))
         if not tracks:
             return await send(ctx, "noTrackFound")
         
@@ -313,7 +319,7 @@ class Basic(commands.Cog):
         if ctx.interaction:
             await ctx.interaction.response.defer()
             
-        tracks = await player.get_tracks(query, requester=ctx.author)
+        tracks = await player.get_tracks(query, requester=ctx.author, limit=max(player.queue.space, 1))
         if not tracks:
             return await send(ctx, "noTrackFound")
         
@@ -542,7 +548,7 @@ class Basic(commands.Cog):
             track_ids = bytes.split(b"\n")[-1]
             track_ids = track_ids.decode().split(",")
             
-            tracks = [voicelink.Track(track_id=track_id, info=voicelink.decode(track_id), requester=ctx.author) for track_id in track_ids]
+            tracks = [track for track in await player.node.build_tracks(track_ids, ctx.author) if track]
             if not tracks:
                 return await send(ctx, "noTrackFound")
 
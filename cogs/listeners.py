@@ -41,6 +41,7 @@ class Listeners(commands.Cog):
         
     async def start_nodes(self) -> None:
         """Connect and intiate nodes."""
+        voicelink.NodePool.search_cache = voicelink.SearchCache(**func.settings.search_cache)
         for n in func.settings.nodes.values():
             try:
                 await self.voicelink.create_node(
@@ -84,18 +85,16 @@ class Listeners(commands.Cog):
 
                 # Restore the queue.
                 queue_data = data.get("queue", {})
-                for track_data in queue_data.get("tracks", []):
-                    track_id = track_data.get("track_id")
-                    if not track_id:
-                        continue
-
-                    decoded_track = voicelink.decode(track_id)
-                    requester = channel.guild.get_member(track_data.get("requester_id"))
-                    track = voicelink.Track(track_id=track_id, info=decoded_track, requester=requester)
-                    player.queue._queue.append(track)
+                tracks_data = [track_data for track_data in queue_data.get("tracks", []) if track_data.get("track_id")]
+                tracks = []
+                for track_data, track in zip(tracks_data, await player.node.build_tracks([track_data["track_id"] for track_data in tracks_data])):
+                    if track:
+                        track.requester = channel.guild.get_member(track_data.get("requester_id"))
+                        tracks.append(track)
+                player.queue.replace("queue", tracks)
                 
                 # Restore queue settings.
-                player.queue._position = queue_data.get("position", 0) - 1
+                player.queue._position = max(queue_data.get("position", 0) - 1, 0)
                 repeat_mode = queue_data.get("repeat_mode", "OFF")
                 try:
                     loop_mode = voicelink.LoopType[repeat_mode]
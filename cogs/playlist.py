@@ -136,9 +136,7 @@ class Playlists(commands.Cog, name="playlist"):
             if not result['playlist']['tracks']:
                 return await send(ctx, 'playlistNoTrack', result['playlist']['name'], ephemeral=True)
 
-            _tracks = []
-            for track in result['playlist']['tracks'][:max_t]:
-                _tracks.append(voicelink.Track(track_id=track, info=voicelink.decode(track), requester=ctx.author))
+            _tracks = [voicelink.LazyTrack(track_id, ctx.author) for track_id in result['playlist']['tracks'][:max_t]]
                     
             tracks = {"name": result['playlist']['name'], "tracks": _tracks}
 
@@ -181,12 +179,8 @@ class Playlists(commands.Cog, name="playlist"):
                             results.append({'emoji': ('🔒' if max_p < index else '🤝'), 'id': data, 'time': tracks['time'], 'name': user[data]['name'], 'tracks': tracks['tracks'], 'perms': playlist['perms'], 'owner': user[data]['user'], 'type': 'share'})
                             continue
                         
-                    init = []
-                    for track in playlist['tracks']:
-                        dt = voicelink.decode(track)
-                        time += dt.get("length", 0)
-                        init.append(dt)
-                    playlist['tracks'] = init
+                    playlist['tracks'] = [voicelink.LazyTrack(track_id) for track_id in playlist['tracks']]
+                    time = sum(track.length for track in playlist['tracks'])
                     results.append({'emoji': ('🔒' if max_p < index else ('🤝' if share else '❤️')), 'id': data, 'time': ctime(time), 'name': user[data]['name'], 'tracks': playlist['tracks'], 'perms': playlist['perms'], 'owner': user[data].get('user', None), 'type': user[data]['type']})
         
             except:
@@ -416,8 +410,8 @@ class Playlists(commands.Cog, name="playlist"):
 
         await update_user(ctx.author.id, {"$pull": {f'playlist.{result["id"]}.tracks': result['playlist']['tracks'][position - 1]}})
         
-        track = voicelink.decode(result['playlist']['tracks'][position - 1])
-        await send(ctx, 'playlistRemoved', track.get("title"), ctx.author, name)
+        track = voicelink.LazyTrack(result['playlist']['tracks'][position - 1])
+        await send(ctx, 'playlistRemoved', track.title, ctx.author, name)
 
     @playlist.command(name="clear", aliases=get_aliases("clear"))
     @commands.dynamic_cooldown(cooldown_check, commands.BucketType.guild)
@@ -449,9 +443,7 @@ class Playlists(commands.Cog, name="playlist"):
             if not result['playlist']['tracks']:
                 return await send(ctx, 'playlistNoTrack', result['playlist']['name'], ephemeral=True)
 
-            _tracks = []
-            for track in result['playlist']['tracks']:
-                _tracks.append(voicelink.Track(track_id=track, info=voicelink.decode(track), requester=ctx.author))
+            _tracks = [voicelink.LazyTrack(track_id, ctx.author) for track_id in result['playlist']['tracks']]
                     
             tracks = {"name": result['playlist']['name'], "tracks": _tracks}
 
@@ -297,6 +297,8 @@ class Settings(commands.Cog, name="settings"):
 
         available_memory, total_memory = memory.available, memory.total
         used_disk_space, total_disk_space = disk.used, disk.total
+        reports = [player.queue.memory_report() for player in self.bot.voice_clients if isinstance(player, voicelink.Player)]
+        search_cache = voicelink.NodePool.search_cache.stats()
         embed = discord.Embed(title="📄 Debug Panel", color=func.settings.embed_color)
         embed.description = "```==    System Info    ==\n" \
                             f"• CPU:     {psutil.cpu_freq().current}Mhz ({psutil.cpu_percent()}%)\n" \
@@ -309,7 +311,9 @@ class Settings(commands.Cog, name="settings"):
                   f"• LATENCY: {self.bot.latency:.2f}ms\n" \
                   f"• GUILDS:  {len(self.bot.guilds)}\n" \
                   f"• USERS:   {sum([guild.member_count or 0 for guild in self.bot.guilds])}\n" \
-                  f"• PLAYERS: {len(self.bot.voice_clients)}```",
+                  f"• PLAYERS: {len(self.bot.voice_clients)}\n" \
+                  f"• HISTORY: {sum(report['spilled'] for report in reports)} spilled, {sum(report['dropped'] for report in reports)} dropped\n" \
+                  f"• SEARCH:  {search_cache['size']} cached, {search_cache['hits']} hits, {search_cache['misses']} misses ({search_cache['hit_rate'] * 100:.1f}%)```",
             inline=False
         )
 
@@ -323,7 +327,8 @@ class Settings(commands.Cog, name="settings"):
                         f"• PLAYERS: {len(node._players)}\n" \
                         f"• CPU:     {node.stats.cpu_process_load:.1f}%\n" \
                         f"• RAM:     {format_bytes(node.stats.free)}/{format_bytes(total_memory, True)} ({(node.stats.free/total_memory) * 100:.1f}%)\n"
-                        f"• LATENCY: {node.latency:.2f}ms\n" \
+                        f"• LATENCY: {func.format_ms(node.latency)} (p95 {func.format_ms(node.latency_sampler.percentile(95))})\n" \
+                        f"• QUEUED:  {node.scheduler.queued} ({node.scheduler.average_delay() * 1000:.2f}ms wait)\n" \
                         f"• UPTIME:  {func.time(node.stats.uptime)}```"
                 )
             else:
@@ -23,6 +23,7 @@ SOFTWARE.
 
 import discord, json, os, copy, logging
 
+from math import isinf
 from discord.ext import commands
 from time import strptime
 from addons import Settings
@@ -176,6 +177,12 @@ def format_bytes(bytes: int, unit: bool = False):
     else:
         return f"{bytes / (1024 ** 3):.1f}" + ("GB" if unit else "")
     
+def format_ms(value: Optional[float]) -> str:
+    """Formats a latency in milliseconds, or "measuring" before the first sample."""
+    if value is None or isinf(value):
+        return "measuring"
+    return f"{value:.2f}ms"
+
 async def get_lang(guild_id:int, *keys) -> Optional[Union[list[str], str]]:
     settings = await get_settings(guild_id)
     lang = settings.get("lang", "EN")
@@ -1,11 +1,12 @@
 import time, re
 import function as func
 
+from math import isinf
 from typing import List, Dict, Union, Optional
 
 from discord import User, Member, VoiceChannel
 from discord.ext import commands
-from voicelink import Player, Track, Playlist, NodePool, decode, LoopType, Filters
+from voicelink import Player, Track, LazyTrack, Playlist, NodePool, decode, LoopType, Filters, RequestPriority
 from addons import LYRICS_PLATFORMS
 
 RATELIMIT_COUNTER: Dict[int, Dict[str, float]] = {}
@@ -119,6 +120,7 @@ async def initPlayer(player: Player, member: Member, data: Dict) -> Dict:
             "name": member.name
         } for member in player.channel.members ],
         "tracks": [ {"trackId": track.track_id, "requesterId": str(track.requester.id)} for track in player.queue._queue ],
+        "queueDuration": None if isinf(duration := player.queue.tracks_length()) else duration,
         "repeatMode": player.queue.repeat.lower(),
         "channelName": player.channel.name,
         "currentQueuePosition": player.queue._position + (0 if player.is_playing else 1),
@@ -208,11 +210,11 @@ async def moveTrack(player: Player, member: Member, data: Dict) -> None:
 
 async def addTracks(player: Player, member: Member, data: Dict) -> None:
     _type = data.get("type", "addToQueue")
-    tracks = [Track(
-        track_id=track_id, 
-        info=decode(track_id),
-        requester=member
-    ) for track_id in data.get("tracks", [])]
+    track_ids = data.get("tracks", [])
+    tracks = [
+        track for track in await player.node.build_tracks(track_ids, member, local_first=True, priority=RequestPriority.NORMAL)
+        if track
+    ]
 
     if _type == "addToQueue":
         await player.add_track(tracks)
@@ -255,6 +257,10 @@ async def shuffleTrack(player: Player, member: Member, data: Dict) -> None:
     
     await player.shuffle(data.get("type", "queue"), member)
 
+@require_permission()
+async def unshuffleTrack(player: Player, member: Member, data: Dict) -> None:
+    await player.unshuffle(data.get("type", "queue"), member)
+
 @require_permission()
 async def repeatTrack(player: Player, member: Member, data: Dict) -> None:
     await player.set_repeat(requester=member)
@@ -506,7 +512,7 @@ async def updatePlaylist(bot: commands.Bot, data: Dict) -> Dict:
         if len(playlist['tracks']) >= max_t:
             return error_msg(f"You have reached the limit! You can only add {max_t} songs to your playlist.", user_id=user_id)
 
-        decoded_track = Track(track_id=track_id, info=decode(track_id), requester=None)
+        decoded_track = LazyTrack(track_id)
         if decoded_track.is_stream:
             return error_msg("You are not allowed to add streaming videos to your playlist.", user_id=user_id)
         
@@ -540,14 +546,14 @@ async def updatePlaylist(bot: commands.Bot, data: Dict) -> Dict:
         
         await func.update_user(user_id, {"$pull": {f'playlist.{playlist_id}.tracks': playlist['tracks'][track_position]}})
         
-        decoded_track = decode(playlist['tracks'][track_position])
+        decoded_track = LazyTrack(playlist['tracks'][track_position])
         return {
             "op": "updatePlaylist",
             "status": "removeTrack",
             "playlistId": playlist_id,
             "trackPosition": track_position,
             "trackId": track_id,
-            "msg": f"Removed '{decoded_track['title']}' from '{playlist['name']}' playlist.",
+            "msg": f"Removed '{decoded_track.title}' from '{playlist['name']}' playlist.",
             "userId": str(user_id)
         }
 
@@ -715,6 +721,7 @@ METHODS: Dict[str, Union[SystemMethod, PlayerMethod]] = {
     "moveTrack": PlayerMethod(moveTrack),
     "addTracks": PlayerMethod(addTracks, auto_connect=True),
     "shuffleTrack": PlayerMethod(shuffleTrack, credit=3),
+    "unshuffleTrack": PlayerMethod(unshuffleTrack, credit=3),
     "repeatTrack": PlayerMethod(repeatTrack),
     "removeTrack": PlayerMethod(removeTrack),
     "clearQueue": PlayerMethod(clearQueue),
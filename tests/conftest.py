@@ -0,0 +1,5 @@
+import function as func
+
+from addons import Settings
+
+func.settings = Settings(func.open_json("settings Example.json"))
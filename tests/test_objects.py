@@ -0,0 +1,42 @@
+import gc
+import json
+import os
+
+from voicelink.objects import Track, TrackMetadata, _metadata
+
+class Requester:
+    def __init__(self, id: int) -> None:
+        self.id = id
+        self.bot = False
+
+with open(os.path.join(os.path.dirname(__file__), "data", "transformer_baseline.json"), encoding="utf-8") as file:
+    BASELINE = json.load(file)
+
+METADATA_FIELDS = ("identifier", "title", "author", "uri", "source", "thumbnail", "emoji", "length", "is_stream", "is_seekable", "identity")
+
+def test_tracks_share_metadata():
+    case = BASELINE[0]
+    first = Track(track_id=case["encoded"], info=case["info"], requester=Requester(1))
+    second = Track(track_id=case["encoded"], info=dict(case["info"]), requester=Requester(2))
+    copy = first.copy(Requester(3))
+
+    assert first._metadata is second._metadata is copy._metadata
+    assert (first.requester.id, second.requester.id, copy.requester.id) == (1, 2, 3)
+    for field in METADATA_FIELDS:
+        assert getattr(first._metadata, field) == getattr(TrackMetadata(case["info"]), field)
+
+    del first, second, copy
+    gc.collect()
+    assert case["encoded"] not in _metadata
+
+def test_build_many_matches_track():
+    requester = Requester(1)
+    response = [{"encoded": case["encoded"], "info": case["info"], "pluginInfo": {}} for case in BASELINE if case["info"]["uri"]]
+    built = Track.build_many(response, requester)
+
+    assert len(built) == len(response)
+    for track, item in zip(built, response):
+        expected = Track(track_id=item["encoded"], info=item["info"], requester=requester)
+        assert track._metadata is expected._metadata
+        assert (track.track_id, track.requester, track.position, track.end_time, track._search_type) == \
+               (expected.track_id, expected.requester, expected.position, expected.end_time, expected._search_type)
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import pytest
+
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+
+from voicelink.enums import RequestMethod
+from voicelink.exceptions import QueueFull
+from voicelink.filters import Filters
+from voicelink.objects import Track, LazyTrack
+from voicelink.player import Player
+from voicelink.pool import Node
+from voicelink.queue import Queue
+
+from test_pool import make_node
+
+class StubNode:
+    """Records the REST requests of the players instead of sending them."""
+
+    def __init__(self) -> None:
+        self._session_id = "session"
+        self._identifier = "stub"
+        self._players: Dict[int, Player] = {}
+        self.yt_ratelimit = None
+        self.calls: List[Tuple[str, str, Any]] = []
+
+    async def send(self, method: RequestMethod, query: str = None, data: Any = {}, **kwargs) -> Any:
+        self.calls.append((method.value, query, dict(data) if isinstance(data, dict) else data))
+        return {}
+
+def make_player(node, guild_id: int = 1) -> Player:
+    player = Player.__new__(Player)
+    player._node = node
+    player._guild = SimpleNamespace(id=guild_id, name="guild")
+    player._logger = logging.getLogger("voicelink")
+    player._ipc = SimpleNamespace(_is_connected=False)
+    player._ipc_connection = False
+    player._pending_update, player._pending_query, player._batch_depth = {}, None, 0
+    player._volume, player._paused, player._filters = 80, True, Filters()
+    player._voice_state = {"sessionId": "voice", "event": {"token": "token", "endpoint": "endpoint"}}
+    player._current = Track(track_id="encoded", info={
+        "title": "title", "author": "author", "length": 100_000, "identifier": "id",
+        "uri": "https://example.com/id", "sourceName": "youtube", "isStream": False, "position": 0
+    }, requester=None)
+    player._last_position, player._last_update, player._position, player._ping = 5000, 0, 0, 0
+    player._is_connected = True
+    player.pause_votes, player.resume_votes = set(), set()
+    node._players[guild_id] = player
+    return player
+
+def test_batch_update_merges_patches():
+    node = StubNode()
+    player = make_player(node)
+
+    async def update():
+        async with player.batch_update():
+            await player.set_volume(50)
+            async with player.batch_update():
+                await player.set_pause(False)
+            await player.send(RequestMethod.PATCH, data={"volume": 70})
+            assert not node.calls
+
+    asyncio.run(update())
+    assert node.calls == [("patch", "sessions/session/players/1", {"volume": 70, "paused": False})]
+
+def test_batch_update_keeps_request_order():
+    node = StubNode()
+    player = make_player(node)
+
+    async def update():
+        async with player.batch_update():
+            await player.set_pause(False)
+            await player.send(RequestMethod.DELETE)
+            await player.set_volume(50)
+
+    asyncio.run(update())
+    assert [(method, data) for method, _, data in node.calls] == [("patch", {"paused": False}), ("delete", {}), ("patch", {"volume": 50})]
+
+def test_patches_outside_a_batch_are_sent_at_once():
+    node = StubNode()
+    player = make_player(node)
+
+    asyncio.run(player.set_volume(50))
+    asyncio.run(player.set_pause(False))
+    assert len(node.calls) == 2
+
+def test_change_node_sends_a_single_patch(monkeypatch):
+    old, new = StubNode(), StubNode()
+    player = make_player(old)
+    monkeypatch.setattr(Player, "position", property(lambda self: 5000))
+    monkeypatch.setattr("voicelink.player.NodePool.get_node", lambda identifier=None: new)
+
+    asyncio.run(player.change_node("new"))
+    assert [method for method, _, _ in old.calls] == ["delete"]
+    assert len(new.calls) == 1
+    assert new.calls[0][2].keys() == {"voice", "volume", "encodedTrack", "position", "paused"}
+
+def make_reconnecting_node(resumed: bool, remote_players: List[dict]) -> Tuple[Node, List[Tuple[str, str]]]:
+    node = make_node("resume")
+    node._session_id, node._resumed = "session", resumed
+    calls = []
+
+    async def send(method: RequestMethod, query: str = None, data: Any = {}, **kwargs) -> Any:
+        calls.append((method.value, query))
+        return remote_players if method == RequestMethod.GET else {}
+
+    node.send = send
+    for guild_id in range(20):
+        make_player(node, guild_id)
+    return node, calls
+
+def test_resumed_session_only_replays_changed_players():
+    remote_players = [{
+        "guildId": str(guild_id), "track": {"encoded": "encoded"}, "paused": True, "voice": {"sessionId": "voice"},
+        "state": {"time": 1, "position": 42, "connected": True, "ping": 3}
+    } for guild_id in range(15)]
+    remote_players.append({"guildId": "999", "track": None, "paused": False, "voice": {}, "state": {}})
+    node, calls = make_reconnecting_node(True, remote_players)
+
+    asyncio.run(node.reconnect())
+    assert sorted(calls) == sorted(
+        [("get", "sessions/session/players"), ("delete", "sessions/session/players/999")] +
+        [("patch", f"sessions/session/players/{guild_id}?noReplace=False") for guild_id in range(15, 20)]
+    )
+    assert node.players[0]._last_position == 42
+
+def test_new_session_replays_every_player():
+    node, calls = make_reconnecting_node(False, [])
+
+    asyncio.run(node.reconnect())
+    assert sorted(calls) == sorted(("patch", f"sessions/session/players/{guild_id}?noReplace=False") for guild_id in range(20))
+
+def test_add_track_only_builds_the_lazy_tracks_that_fit(monkeypatch):
+    player = make_player(StubNode())
+    player.queue = Queue(10, True, lambda key: key)
+    built = []
+    monkeypatch.setattr(LazyTrack, "to_track", lambda self: built.append(self) or player._current.copy(self.requester))
+
+    assert asyncio.run(player.add_track([LazyTrack("encoded") for _ in range(50)])) == 10
+    assert len(built) == 10
+
+    with pytest.raises(QueueFull):
+        asyncio.run(player.add_track([LazyTrack("encoded") for _ in range(50)]))
+    assert len(built) == 11
@@ -0,0 +1,75 @@
+import logging
+import pytest
+
+from types import SimpleNamespace
+from typing import Optional
+
+from voicelink.enums import NodeAlgorithm, SearchType
+from voicelink.pool import Node, NodePool, SearchCache
+from voicelink.utils import NodeStats
+
+BOT = SimpleNamespace(user=SimpleNamespace(id=1), add_listener=lambda *args: None)
+
+def make_node(identifier: str, regions: Optional[list] = None) -> Node:
+    node = Node(
+        pool=NodePool, bot=BOT, host="localhost", port=2333, password="youshallnotpass",
+        identifier=identifier, session=SimpleNamespace(), regions=regions, logger=logging.getLogger("voicelink")
+    )
+    node._available = True
+    return node
+
+def make_stats(playing: int, cpu: float = 0.0, nulled: int = 0, used: int = 0) -> NodeStats:
+    return NodeStats({
+        "players": playing, "playingPlayers": playing, "uptime": 0,
+        "memory": {"used": used, "free": 0, "reservable": 1000, "allocated": 0},
+        "cpu": {"cores": 4, "systemLoad": cpu, "lavalinkLoad": cpu},
+        "frameStats": {"sent": 3000 * playing, "nulled": nulled, "deficit": 0}
+    })
+
+@pytest.fixture
+def nodes(monkeypatch):
+    pool = {}
+    monkeypatch.setattr(NodePool, "_nodes", pool)
+    return pool
+
+def test_by_load_prefers_lowest_penalty(nodes):
+    idle, busy, lossy = make_node("idle"), make_node("busy"), make_node("lossy")
+    idle._stats, busy._stats, lossy._stats = make_stats(10), make_stats(2, cpu=0.9), make_stats(1, nulled=600)
+    nodes.update({node._identifier: node for node in (idle, busy, lossy)})
+    assert NodePool.get_best_node(algorithm=NodeAlgorithm.BY_LOAD) is idle
+
+    idle._stats = make_stats(10, used=990)
+    assert idle.penalty > busy.penalty
+    assert NodePool.get_best_node(algorithm=NodeAlgorithm.BY_LOAD) is not idle
+
+def test_by_load_falls_back_to_player_count(nodes):
+    empty, full = make_node("empty"), make_node("full")
+    full._players = {guild_id: None for guild_id in range(3)}
+    nodes.update({"empty": empty, "full": full})
+    assert NodePool.get_best_node(algorithm=NodeAlgorithm.BY_LOAD) is empty
+
+    empty._available = False
+    assert NodePool.get_best_node(algorithm=NodeAlgorithm.BY_LOAD) is full
+
+def test_by_affinity_only_moves_the_guilds_of_a_removed_node(nodes):
+    nodes.update({identifier: make_node(identifier) for identifier in ("a", "b", "c")})
+    placement = {guild_id: NodePool.get_best_node(algorithm=NodeAlgorithm.BY_AFFINITY, guild_id=guild_id)._identifier for guild_id in range(3000)}
+    assert placement == {guild_id: NodePool.get_best_node(algorithm=NodeAlgorithm.BY_AFFINITY, guild_id=guild_id)._identifier for guild_id in range(3000)}
+    for identifier in ("a", "b", "c"):
+        assert 800 < list(placement.values()).count(identifier) < 1200
+
+    nodes["c"]._available = False
+    for guild_id, identifier in placement.items():
+        moved = NodePool.get_best_node(algorithm=NodeAlgorithm.BY_AFFINITY, guild_id=guild_id)._identifier
+        assert moved == identifier if identifier != "c" else moved in ("a", "b")
+
+def test_by_affinity_stays_in_the_voice_region(nodes):
+    nodes.update({"us": make_node("us", ["us-east"]), "eu": make_node("eu", ["rotterdam"])})
+    for guild_id in range(100):
+        assert NodePool.get_best_node(algorithm=NodeAlgorithm.BY_AFFINITY, region="us-west", guild_id=guild_id) is nodes["us"]
+
+def test_search_cache_key_only_normalizes_free_text():
+    assert SearchCache.key("ytsearch:  Never  Gonna ", SearchType.YOUTUBE) == SearchCache.key("ytsearch:never gonna", SearchType.YOUTUBE)
+    assert SearchCache.key("Never  Gonna", SearchType.YOUTUBE) == SearchCache.key("never gonna", SearchType.YOUTUBE)
+    assert SearchCache.key("sprec:seed_tracks=AbC", SearchType.SPOTIFY) != SearchCache.key("sprec:seed_tracks=abc", SearchType.SPOTIFY)
+    assert SearchCache.key("https://youtu.be/AbC", SearchType.YOUTUBE) != SearchCache.key("https://youtu.be/abc", SearchType.YOUTUBE)
@@ -0,0 +1,178 @@
+import pytest
+import random
+
+from math import inf
+from typing import List
+
+from voicelink.exceptions import QueueFull
+from voicelink.objects import Track
+from voicelink.queue import Queue, FairQueue
+
+class Requester:
+    def __init__(self, id: int) -> None:
+        self.id = id
+        self.bot = False
+
+REQUESTERS = [Requester(index) for index in range(6)]
+
+def get_msg(key: str) -> str:
+    return key
+
+def make_track(index: int, requester: Requester, length: int = 1000, stream: bool = False) -> Track:
+    info = {
+        "identifier": f"id{index}", "title": f"title{index}", "author": "author", "length": length,
+        "uri": f"https://example.com/{index}", "sourceName": "youtube", "isStream": stream,
+        "position": 0, "artworkUrl": None, "isrc": None
+    }
+    return Track(track_id=None, info=info, requester=requester)
+
+class BaselineFairQueue(Queue):
+    """The insert of the original FairQueue, a scan over the upcoming tracks."""
+
+    def put(self, item: Track) -> int:
+        if len(self._queue) >= self._size:
+            raise QueueFull(self.get_msg("voicelinkQueueFull").format(self._size))
+
+        tracks = self.tracks(incTrack=True)
+        lastIndex = len(tracks)
+        for track in reversed(tracks):
+            if track.requester == item.requester:
+                break
+            lastIndex -= 1
+        requesters = set()
+        for track in tracks[lastIndex:]:
+            if track.requester in requesters:
+                break
+            lastIndex += 1
+            requesters.add(track.requester)
+
+        self.put_at_index(lastIndex, item)
+        return lastIndex
+
+def upcoming(queue: Queue) -> List[int]:
+    return [id(track) for track in queue._queue[max(queue._position - 1, 0):]]
+
+def test_fair_queue_matches_baseline():
+    for seed in range(500):
+        rng = random.Random(seed)
+        baseline = BaselineFairQueue(10_000, True, get_msg)
+        fair = FairQueue(10_000, True, get_msg, history_size=3, spill_size=5)
+
+        first = make_track(0, rng.choice(REQUESTERS))
+        baseline.put(first), fair.put(first)
+        baseline.get(), fair.get()
+
+        for index in range(1, 80):
+            op = rng.random()
+            if op < 0.6:
+                track = make_track(index, rng.choice(REQUESTERS))
+                assert baseline.put(track) == fair.put(track), seed
+            elif op < 0.85:
+                assert baseline.get() is fair.get(), seed
+            elif op < 0.92 and baseline.count >= 2:
+                first, second = rng.randint(1, baseline.count), rng.randint(1, baseline.count)
+                baseline.swap(first, second), fair.swap(first, second)
+            elif baseline.count >= 1:
+                target = rng.randint(1, baseline.count)
+                baseline.remove(target), fair.remove(target)
+
+            assert upcoming(baseline) == upcoming(fair), seed
+
+def random_queue(rng: random.Random, size: int = 10_000, history_size: int = 0) -> Queue:
+    queue = Queue(size, True, get_msg, history_size=history_size, spill_size=50)
+    for index in range(rng.randint(1, 40)):
+        queue.put(make_track(index, rng.choice(REQUESTERS), rng.randint(1, 10_000), rng.random() < 0.05))
+    for _ in range(rng.randint(1, 30)):
+        queue.get()
+    return queue
+
+def test_windowed_views_match_slices():
+    for seed in range(300):
+        rng = random.Random(seed)
+        queue = random_queue(rng)
+        tracks, history = queue.tracks(), queue.history()
+        assert queue.count == len(tracks)
+        assert queue.history_count == len(history)
+
+        start, stop = rng.randint(0, 45), rng.randint(0, 45)
+        assert list(queue.iter_tracks(start, stop)) == tracks[start:stop]
+        assert list(queue.iter_tracks(start, stop, incTrack=True)) == queue.tracks(incTrack=True)[start:stop]
+        assert list(queue.iter_history(start, stop)) == history[start:stop]
+        assert list(queue.iter_history(start, stop, reverse=True)) == history[::-1][start:stop]
+
+        if queue.count:
+            index = rng.randint(1, queue.count)
+            expected = queue.tracks(incTrack=True)
+            removed = expected.pop(index)
+            assert list(queue.remove(index).values()) == [removed]
+            assert queue.tracks(incTrack=True) == expected
+            assert queue.count == len(expected) - 1
+
+def test_put_many_matches_put():
+    for seed in range(200):
+        rng = random.Random(seed)
+        size = rng.randint(1, 30)
+        single, bulk = Queue(size, True, get_msg), Queue(size, True, get_msg)
+        items = [make_track(index, rng.choice(REQUESTERS)) for index in range(rng.randint(1, 40))]
+
+        added = []
+        for item in items:
+            try:
+                single.put(item)
+            except QueueFull:
+                break
+            added.append(item)
+
+        assert bulk.put_many(items) == added
+        assert bulk._queue == single._queue
+        assert all(item in bulk for item in added)
+
+        if bulk.space:
+            bulk.put_many(items * size)
+        with pytest.raises(QueueFull):
+            bulk.put_many(items)
+
+def naive_length(tracks: List[Track]) -> float:
+    return inf if any(track.is_stream for track in tracks) else sum(track.length for track in tracks)
+
+def test_lengths_match_naive_sum():
+    for seed in range(150):
+        rng = random.Random(seed)
+        queue = random_queue(rng, history_size=rng.choice([0, 5]))
+        for index in range(40, 100):
+            op = rng.random()
+            if op < 0.4:
+                queue.put(make_track(index, rng.choice(REQUESTERS), rng.randint(1, 10_000), rng.random() < 0.03))
+            elif op < 0.6:
+                queue.get()
+            elif op < 0.7:
+                queue.put_at_front(make_track(index, rng.choice(REQUESTERS), rng.randint(1, 10_000)))
+            elif queue.count >= 2:
+                first, second = rng.randint(1, queue.count), rng.randint(1, queue.count)
+                if op < 0.8:
+                    queue.swap(first, second)
+                elif op < 0.9:
+                    queue.move(first, second)
+                else:
+                    queue.remove(first)
+
+            tracks = queue.tracks()
+            assert queue.tracks_length() == naive_length(tracks)
+            assert queue.tracks_length(incTrack=True) == naive_length(queue.tracks(incTrack=True))
+            assert queue.history_length() == naive_length(queue.history())
+            for position in range(1, len(tracks) + 2):
+                assert queue.time_until(position) == naive_length(tracks[:position - 1])
+
+def test_space_matches_put():
+    for queue_cls in (Queue, FairQueue):
+        queue = queue_cls(10, True, get_msg)
+        for index in range(6):
+            queue.put(make_track(index, REQUESTERS[index % 2]))
+        for _ in range(4):
+            queue.get()
+
+        space = queue.space
+        for index in range(space):
+            queue.put(make_track(index, REQUESTERS[0]))
+        with pytest.raises(QueueFull):
+            queue.put(make_track(space, REQUESTERS[0]))
@@ -0,0 +1,86 @@
+import asyncio
+
+from voicelink.enums import RequestPriority
+from voicelink.ratelimit import RequestScheduler
+
+async def hold(scheduler: RequestScheduler, priority: RequestPriority, order: list, release: asyncio.Event, source: str = None) -> None:
+    async with scheduler.slot(priority, source):
+        order.append(priority)
+        await release.wait()
+
+def test_waiters_start_by_priority():
+    async def run():
+        scheduler = RequestScheduler({"max_concurrency": 1, "bulk_concurrency": 1})
+        order, release = [], asyncio.Event()
+        first = asyncio.create_task(hold(scheduler, RequestPriority.NORMAL, order, release))
+        await asyncio.sleep(0)
+
+        tasks = [asyncio.create_task(hold(scheduler, priority, order, release)) for priority in (
+            RequestPriority.BULK, RequestPriority.NORMAL, RequestPriority.INTERACTIVE, RequestPriority.BULK
+        )]
+        await asyncio.sleep(0)
+        assert scheduler.active == 1 and scheduler.queued == 4
+
+        release.set()
+        await asyncio.gather(first, *tasks)
+        assert scheduler.active == 0
+        return order
+
+    assert asyncio.run(run()) == [
+        RequestPriority.NORMAL, RequestPriority.INTERACTIVE, RequestPriority.NORMAL, RequestPriority.BULK, RequestPriority.BULK
+    ]
+
+def test_bulk_requests_keep_slots_free():
+    async def run():
+        scheduler = RequestScheduler({"max_concurrency": 3, "bulk_concurrency": 1})
+        order, release = [], asyncio.Event()
+        tasks = [asyncio.create_task(hold(scheduler, RequestPriority.BULK, order, release)) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert scheduler.active == 1
+
+        interactive = asyncio.create_task(hold(scheduler, RequestPriority.INTERACTIVE, order, release))
+        await asyncio.sleep(0)
+        assert scheduler.active == 2
+
+        release.set()
+        await asyncio.gather(interactive, *tasks)
+
+    asyncio.run(run())
+
+def test_cancelled_waiters_release_their_slot():
+    async def run():
+        scheduler = RequestScheduler({"max_concurrency": 1})
+        order, release = [], asyncio.Event()
+        first = asyncio.create_task(hold(scheduler, RequestPriority.NORMAL, order, release))
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(hold(scheduler, RequestPriority.INTERACTIVE, order, release))
+        last = asyncio.create_task(hold(scheduler, RequestPriority.BULK, order, release))
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        release.set()
+        await asyncio.gather(first, last, cancelled, return_exceptions=True)
+        assert cancelled.cancelled()
+        assert scheduler.active == 0 and scheduler.queued == 0
+        return order
+
+    assert asyncio.run(run()) == [RequestPriority.NORMAL, RequestPriority.BULK]
+
+def test_cancelled_requests_refund_their_token():
+    async def run():
+        scheduler = RequestScheduler({"sources": {"youtube": {"rate": 1, "burst": 1}}})
+        bucket = scheduler.buckets["youtube"]
+        order, release = [], asyncio.Event()
+        release.set()
+
+        await hold(scheduler, RequestPriority.NORMAL, order, release, "youtube")
+        waiting = asyncio.create_task(hold(scheduler, RequestPriority.NORMAL, order, release, "youtube"))
+        await asyncio.sleep(0)
+        assert bucket.tokens < 0
+
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        assert 0 <= bucket.tokens < 1
+        return order
+
+    assert asyncio.run(run()) == [RequestPriority.NORMAL]
@@ -0,0 +1,26 @@
+import json
+import os
+
+from voicelink.transformer import encode, decode, decode_many
+
+# Track ids encoded and decoded by the transformer before the decode cache was added.
+with open(os.path.join(os.path.dirname(__file__), "data", "transformer_baseline.json"), encoding="utf-8") as file:
+    BASELINE = json.load(file)
+
+def test_encode_matches_baseline():
+    for case in BASELINE:
+        assert encode(case["info"]) == case["encoded"]
+
+def test_decode_matches_baseline():
+    for case in BASELINE:
+        assert decode(case["encoded"]) == case["decoded"]
+
+def test_decode_many_matches_decode():
+    encoded = [case["encoded"] for case in BASELINE]
+    assert decode_many(encoded + encoded) == [case["decoded"] for case in BASELINE] * 2
+
+def test_cached_decode_returns_copies():
+    case = BASELINE[0]
+    first = decode(case["encoded"])
+    first["title"] = "changed"
+    assert decode(case["encoded"]) == case["decoded"]
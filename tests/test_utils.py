@@ -0,0 +1,78 @@
+import asyncio
+import json
+import random
+
+from voicelink.utils import JSONStream, extract_domain
+
+class ChunkedReader:
+    """Hands out the body in chunks of at most `chunk_size` bytes, like a slow response."""
+
+    def __init__(self, data: bytes, chunk_size: int) -> None:
+        self.data = data
+        self.index = 0
+        self.chunk_size = chunk_size
+
+    async def read(self, size: int) -> bytes:
+        chunk = self.data[self.index:self.index + min(size, self.chunk_size)]
+        self.index += len(chunk)
+        return chunk
+
+async def read_response(stream: JSONStream) -> dict:
+    response = {}
+    async for key in stream.items():
+        if key != "data":
+            response[key] = await stream.value()
+            continue
+
+        data = response["data"] = {}
+        async for field in stream.items():
+            if field == "tracks":
+                data["tracks"] = [track async for track in stream.elements()]
+            else:
+                data[field] = await stream.value()
+    return response
+
+def test_json_stream_chunk_boundaries():
+    rng = random.Random(0)
+    for _ in range(300):
+        tracks = [{
+            "encoded": "QAAA" * rng.randint(1, 5),
+            "info": {"title": "tïtle€😀" * rng.randint(0, 3), "length": rng.randint(0, 10**9), "isStream": False, "extra": [1, 2.5e3, None, True]},
+            "pluginInfo": {}
+        } for _ in range(rng.randint(0, 30))]
+        document = {"loadType": "playlist", "data": {"info": {"name": "playlist", "selectedTrack": -1}, "pluginInfo": {}, "tracks": tracks}}
+        raw = json.dumps(document, ensure_ascii=rng.random() < 0.5, indent=rng.choice([None, 2])).encode()
+
+        stream = JSONStream(ChunkedReader(raw, rng.randint(1, 50)), chunk_size=rng.randint(1, 64))
+        assert asyncio.run(read_response(stream)) == document
+
+def test_json_stream_values_split_by_chunks():
+    for value in [12345, -1.5e10, "😀", [1, 23456, 7], {"a": 1e10, "b": [None, False]}]:
+        stream = JSONStream(ChunkedReader(json.dumps(value).encode(), 1), chunk_size=1)
+        assert asyncio.run(stream.value()) == value
+
+def test_json_stream_stops_early():
+    raw = json.dumps({"data": {"tracks": list(range(10_000))}}).encode()
+    reader = ChunkedReader(raw, 256)
+    stream = JSONStream(reader, chunk_size=256)
+
+    async def first_tracks(count: int) -> list:
+        tracks = []
+        async for key in stream.items():
+            async for field in stream.items():
+                async for track in stream.elements():
+                    tracks.append(track)
+                    if len(tracks) == count:
+                        return tracks
+        return tracks
+
+    assert asyncio.run(first_tracks(5)) == list(range(5))
+    assert reader.index < len(raw)
+
+def test_extract_domain():
+    assert extract_domain("https://music.youtube.com/watch?v=id") == "youtube"
+    assert extract_domain("https://youtu.be/id") == "youtube"
+    assert extract_domain("https://www.bbc.co.uk/sounds") == "bbc"
+    assert extract_domain("https://spotify.link/id") == "spotify"
+    assert extract_domain("https://on.soundcloud.com/id") == "soundcloud"
+    assert extract_domain("http://user@127.0.0.1:8080/stream") == "127.0.0.1"
@@ -395,9 +395,7 @@ class Tracks(discord.ui.Select):
         self.player: voicelink.Player = player
         
         options = []
-        for index, track in enumerate(self.player.queue.tracks(), start=1):
-            if index > 10:
-                break
+        for index, track in enumerate(self.player.queue.iter_tracks(stop=10), start=1):
             options.append(discord.SelectOption(label=f"{index}. {track.title[:40]}", description=f"{track.author[:30]} · " + ("Live" if track.is_stream else track.formatted_length), emoji=track.emoji))
 
         super().__init__(
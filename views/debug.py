@@ -154,7 +154,7 @@ class NodesDropdown(discord.ui.Select):
         nodes = [
             discord.SelectOption(
                 label=name,
-                description=("🟢 Connected" if node._available else "🔴 Disconnected") + f" - Players: {node.player_count} ({node.latency if node._available else 0:.2f}ms)")
+                description=("🟢 Connected" if node._available else "🔴 Disconnected") + f" - Players: {node.player_count} ({func.format_ms(node.latency) if node._available else 'n/a'})")
             for name, node in voicelink.NodePool._nodes.items()
         ]
         
@@ -296,7 +296,8 @@ class NodesPanel(discord.ui.View):
                             f"• PLAYERS: {len(node._players)}\n" \
                             f"• CPU:     {node.stats.cpu_process_load:.1f}%\n" \
                             f"• RAM:     {func.format_bytes(node.stats.free)}/{func.format_bytes(total_memory, True)} ({(node.stats.free/total_memory) * 100:.1f}%)\n"
-                            f"• LATENCY: {node.latency:.2f}ms\n" \
+                            f"• LATENCY: {func.format_ms(node.latency)} (p95 {func.format_ms(node.latency_sampler.percentile(95))})\n" \
+                            f"• QUEUED:  {node.scheduler.queued} ({node.scheduler.average_delay() * 1000:.2f}ms wait)\n" \
                             f"• UPTIME:  {func.time(node.stats.uptime)}```"
                     )
                 else:
@@ -24,8 +24,8 @@ SOFTWARE.
 import discord
 import function as func
 
-from math import ceil
-from typing import TYPE_CHECKING
+from math import ceil, isinf
+from typing import Iterator, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from voicelink import Player, Track
@@ -41,20 +41,19 @@ class ListView(discord.ui.View):
         self.player: Player = player
 
         self.is_queue: bool = is_queue
-        self.tracks: list[Track] = player.queue.tracks() if is_queue else player.queue.history()
         self.response: discord.Message = None
-
-        if not is_queue:
-            self.tracks.reverse()
         self.author: discord.Member = author
 
-        self.page: int = ceil(len(self.tracks) / 7)
+        self.page: int = ceil((player.queue.count if is_queue else player.queue.history_count) / 7)
         self.current_page: int = 1
 
-        try:
-            self.time: str = func.time(sum([track.length for track in self.tracks]))
-        except Exception as _:
-            self.time = "∞"
+        length = player.queue.tracks_length() if is_queue else player.queue.history_length()
+        self.time: str = "∞" if isinf(length) else func.time(length)
+
+    def get_tracks(self, start: int = 0, stop: Optional[int] = None) -> Iterator["Track"]:
+        if self.is_queue:
+            return self.player.queue.iter_tracks(start, stop)
+        return self.player.queue.iter_history(start, stop, reverse=True)
     
     async def on_timeout(self) -> None:
         for child in self.children:
@@ -72,7 +71,7 @@ class ListView(discord.ui.View):
 
     async def build_embed(self) -> discord.Embed:
         offset: int = self.current_page * 7
-        tracks: list[Track] = self.tracks[(offset-7):offset]
+        tracks: Iterator[Track] = self.get_tracks(offset - 7, offset)
         texts = await func.get_lang(self.author.guild.id, "viewTitle", "viewDesc", "nowplayingDesc", "live", "queueTitle", "historyTitle", "viewFooter")
 
         embed = discord.Embed(title=texts[0], color=func.settings.embed_color)
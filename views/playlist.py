@@ -25,11 +25,11 @@ import discord
 import function as func
 
 from math import ceil
-from tldextract import extract
+from voicelink import extract_domain
 from typing import Any, TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from voicelink import Track
+    from voicelink import Track, LazyTrack
 
 class Select_playlist(discord.ui.Select):
     def __init__(self, results):
@@ -90,7 +90,7 @@ class PlaylistView(discord.ui.View):
         
     async def build_embed(self) -> discord.Embed:
         offset: int = self.current_page * 7
-        tracks: list[Track] = self.current['tracks'][(offset-7):offset]
+        tracks: list[Track | LazyTrack] = self.current['tracks'][(offset-7):offset]
         texts = await func.get_lang(self.author.guild.id, "playlistView", "playlistViewDesc", "settingsPermTitle", "playlistViewPermsValue", "playlistViewPermsValue2", "playlistViewTrack", "playlistNoTrack", "playlistViewPage")
 
         embed = discord.Embed(title=texts[0], color=func.settings.embed_color)
@@ -105,9 +105,9 @@ class PlaylistView(discord.ui.View):
         embed.description += f"\n\n**{texts[5]}:**\n"
         if tracks:
             if self.current.get("type") == "playlist":    
-                embed.description += "\n".join(f"{func.get_source(track['sourceName'], 'emoji')} `{index:>2}.` `[{func.time(track['length'])}]` [{func.truncate_string(track['title'])}]({track['uri']})" for index, track in enumerate(tracks, start=offset - 6))
+                embed.description += "\n".join(f"{track.emoji} `{index:>2}.` `[{track.formatted_length}]` [{func.truncate_string(track.title)}]({track.uri})" for index, track in enumerate(tracks, start=offset - 6))
             else:
-                embed.description += '\n'.join(f"{func.get_source(extract(track.info['uri']).domain, 'emoji')} `{index:>2}.` `[{func.time(track.length)}]` [{func.truncate_string(track.title)}]({track.uri})" for index, track in enumerate(tracks, start=offset - 6))
+                embed.description += '\n'.join(f"{func.get_source(extract_domain(track.info['uri']), 'emoji')} `{index:>2}.` `[{func.time(track.length)}]` [{func.truncate_string(track.title)}]({track.uri})" for index, track in enumerate(tracks, start=offset - 6))
         else:
             embed.description += texts[6].format(self.current['name'])
 
@@ -26,7 +26,7 @@ __author__ = 'Vocard Development, ChocoMeow'
 __license__ = "MIT"
 __copyright__ = "Copyright 2023 - present (c) Vocard Development, ChocoMeow"
 
-from .enums import SearchType, LoopType
+from .enums import SearchType, LoopType, RequestPriority
 from .events import *
 from .exceptions import *
 from .filters import *
@@ -35,4 +35,5 @@ from .player import Player, connect_channel
 from .pool import *
 from .queue import *
 from .placeholders import Placeholders, build_embed
-from .transformer import encode, decode
+from .transformer import encode, decode, decode_header, decode_many, decode_cache_info, encode_cache_info
+from .utils import extract_domain
@@ -90,6 +90,25 @@ class RequestMethod(Enum):
     def __str__(self) -> str:
         return self.value
     
+class RequestPriority(Enum):
+    """The enum for the priority classes of the requests sent to a node.
+
+        RequestPriority.INTERACTIVE is used for player updates a user is waiting on,
+        such as play, pause and seek.
+
+        RequestPriority.NORMAL is used for searches and the rest of the requests.
+
+        RequestPriority.BULK is used for background work, such as autoplay
+        recommendations, batch decoding and replaying players after a reconnect.
+    """
+
+    INTERACTIVE = 0
+    NORMAL = 1
+    BULK = 2
+
+    def __str__(self) -> str:
+        return self.name
+
 class NodeAlgorithm(Enum):
     """The enum for the different node algorithms in Voicelink.
     
@@ -103,12 +122,30 @@ class NodeAlgorithm(Enum):
         NodeAlgorithm.by_region returns a node based on its voice region,
         which the region is specified by the user in the method as an arg. 
         This method will only work if you set a voice region when you create a node.
+
+        NodeAlgorithm.by_load returns the node with the lowest load penalty,
+        built from its playing players, CPU load, lost frames and memory use.
+
+        NodeAlgorithm.by_affinity keeps a guild on the same node across sessions
+        using rendezvous hashing, so only the guilds of a node that joins or
+        leaves the pool are placed differently.
     """
 
     # We don't have to define anything special for these, since these just serve as flags
     BY_PING = auto()
     BY_REGION = auto()
     BY_PLAYERS = auto()
+    BY_LOAD = auto()
+    BY_AFFINITY = auto()
+
+    @classmethod
+    def match(cls, value: str):
+        """find an enum based on its name."""
+        normalized_value = value.upper().replace(" ", "_")
+        if not normalized_value.startswith("BY_"):
+            normalized_value = "BY_" + normalized_value
+
+        return cls.__members__.get(normalized_value)
 
     def __str__(self) -> str:
         return self.value
\ No newline at end of file
@@ -21,11 +21,13 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+from __future__ import annotations
+
 import re
-from typing import Optional
+from typing import Dict, List, Optional
+from weakref import WeakValueDictionary
 
 from discord import Member
-from tldextract import extract
 
 from .enums import SearchType
 from function import (
@@ -33,71 +35,146 @@ from function import (
     time as ctime
 )
 
-from .transformer import encode
+from .transformer import encode, decode, decode_header
+from .utils import extract_domain
 
 YOUTUBE_REGEX = re.compile(r'(https?://)?(www\.)?youtube\.(com|nl)/watch\?v=([-\w]+)')
 
-class Track:
-    """The base track object. Returns critical track information needed for parsing by Lavalink.
-       You can also pass in commands.Context to get a discord.py Context object in your track.
+class TrackMetadata:
+    """The immutable part of a track. Tracks built from the same track id share one instance,
+       which is dropped from the table once no track refers to it anymore.
     """
 
     __slots__ = (
-        "_track_id",
         "info",
         "identifier",
         "title",
         "author",
         "uri",
         "source",
-        "_search_type",
         "thumbnail",
         "emoji",
         "length",
-        "requester",
         "is_stream",
         "is_seekable",
-        "position",
-        "end_time"
+        "identity",
+        "__weakref__"
     )
 
-    def __init__(
-        self,
-        *,
-        track_id: str = None,
-        info: dict,
-        requester: Member,
-        search_type: SearchType = SearchType.YOUTUBE,
-    ):
-        self._track_id: Optional[str] = track_id
+    def __init__(self, info: dict, emoji: Optional[str] = None):
         self.info: dict = info
 
         self.identifier: str = info.get("identifier")
         self.title: str = info.get("title", "Unknown")
         self.author: str = info.get("author", "Unknown")
         self.uri: str = info.get("uri", "https://discord.com/application-directory/605618911471468554")
-        self.source: str = info.get("sourceName", extract(self.uri).domain)
-        self._search_type: SearchType = search_type
+        self.source: str = info["sourceName"] if "sourceName" in info else extract_domain(self.uri)
 
         self.thumbnail: str = info.get("artworkUrl")
         if not self.thumbnail and YOUTUBE_REGEX.match(self.uri):
             self.thumbnail = f"https://img.youtube.com/vi/{self.identifier}/maxresdefault.jpg"
         
-        self.emoji: str = get_source(self.source, "emoji")
+        self.emoji: str = emoji or get_source(self.source, "emoji")
         self.length: float = info.get("length")
-        
-        self.requester: Member = requester
         self.is_stream: bool = info.get("isStream", False)
         self.is_seekable: bool = info.get("isSeekable", True)
-        self.position: int = info.get("position", 0)
+        self.identity: str = self.uri or self.identifier
 
+    @classmethod
+    def get(cls, track_id: Optional[str], info: dict) -> TrackMetadata:
+        """Returns the shared metadata of the track id, building it from the info on the first use."""
+        if not track_id:
+            return cls(info)
+
+        metadata = _metadata.get(track_id)
+        if metadata is None:
+            metadata = _metadata[track_id] = cls(info)
+        return metadata
+
+_metadata: WeakValueDictionary[str, TrackMetadata] = WeakValueDictionary()
+
+class Track:
+    """The base track object. Returns critical track information needed for parsing by Lavalink.
+       You can also pass in commands.Context to get a discord.py Context object in your track.
+       The track information lives in a shared TrackMetadata, the track itself only keeps the
+       requester and the playback range.
+    """
+
+    __slots__ = (
+        "_track_id",
+        "_metadata",
+        "_search_type",
+        "requester",
+        "position",
+        "end_time"
+    )
+
+    def __init__(
+        self,
+        *,
+        track_id: str = None,
+        info: dict,
+        requester: Member,
+        search_type: SearchType = SearchType.YOUTUBE,
+    ):
+        self._track_id: Optional[str] = track_id
+        self._metadata: TrackMetadata = TrackMetadata.get(track_id, info)
+        self._search_type: SearchType = search_type
+
+        self.requester: Member = requester
+        self.position: int = info.get("position", 0)
         self.end_time: Optional[int] = None
 
+    @classmethod
+    def build_many(cls, tracks: List[dict], requester: Member, search_type: SearchType = SearchType.YOUTUBE) -> List[Track]:
+        """Builds the tracks of a Lavalink loadtracks response.
+           The source settings are looked up once per source, and the metadata of the
+           whole batch is interned before the tracks are created.
+        """
+        emojis: Dict[str, str] = {}
+        built: List[Track] = []
+        for track in tracks:
+            track_id, info = track["encoded"], track["info"]
+            metadata = _metadata.get(track_id)
+            if metadata is None:
+                source = info.get("sourceName")
+                if source and source not in emojis:
+                    emojis[source] = get_source(source, "emoji")
+                metadata = _metadata[track_id] = TrackMetadata(info, emojis.get(source))
+
+            # Same state as __init__, without looking the metadata up a second time.
+            item = cls.__new__(cls)
+            item._track_id = track_id
+            item._metadata = metadata
+            item._search_type = search_type
+            item.requester = requester
+            item.position = info.get("position", 0)
+            item.end_time = None
+            built.append(item)
+        return built
+
+    def copy(self, requester: Member) -> Track:
+        """Returns a track sharing this track's metadata for another requester."""
+        item = Track.__new__(Track)
+        item._track_id = self._track_id
+        item._metadata = self._metadata
+        item._search_type = self._search_type
+        item.requester = requester
+        item.position = self.position
+        item.end_time = self.end_time
+        return item
+
     def __eq__(self, other) -> bool:
         if not isinstance(other, Track):
             return False
 
-        return other.track_id == self.track_id
+        if self._track_id and other._track_id:
+            return other._track_id == self._track_id
+
+        return other.identity == self.identity
+
+    def __hash__(self) -> int:
+        return hash(self._metadata.identity)
 
     def __str__(self) -> str:
         return self.title
@@ -112,6 +189,55 @@ class Track:
         
         return self._track_id
     
+    @property
+    def info(self) -> dict:
+        return self._metadata.info
+
+    @property
+    def identifier(self) -> str:
+        return self._metadata.identifier
+
+    @property
+    def title(self) -> str:
+        return self._metadata.title
+
+    @property
+    def author(self) -> str:
+        return self._metadata.author
+
+    @property
+    def uri(self) -> str:
+        return self._metadata.uri
+
+    @property
+    def source(self) -> str:
+        return self._metadata.source
+
+    @property
+    def thumbnail(self) -> str:
+        return self._metadata.thumbnail
+
+    @property
+    def emoji(self) -> str:
+        return self._metadata.emoji
+
+    @property
+    def length(self) -> float:
+        return self._metadata.length
+
+    @property
+    def is_stream(self) -> bool:
+        return self._metadata.is_stream
+
+    @property
+    def is_seekable(self) -> bool:
+        return self._metadata.is_seekable
+
+    @property
+    def identity(self) -> str:
+        """The key used to tell duplicate tracks apart, which is the uri of the track."""
+        return self._metadata.identity
+
     @property
     def formatted_length(self) -> str:
         return ctime(self.length)
@@ -123,6 +249,70 @@ class Track:
             "requester_id": self.requester.id
         }
     
+class LazyTrack:
+    """A read-only view over an encoded track. Only the common fields are decoded, on first access.
+       Call to_track() to build the full Track once it goes into a queue.
+    """
+
+    __slots__ = (
+        "track_id",
+        "requester",
+        "_header"
+    )
+
+    def __init__(self, track_id: str, requester: Member = None):
+        self.track_id: str = track_id
+        self.requester: Member = requester
+        self._header: Optional[dict] = None
+
+    def __repr__(self) -> str:
+        return f"<Voicelink.LazyTrack track_id={self.track_id!r}>"
+
+    @property
+    def header(self) -> dict:
+        if self._header is None:
+            self._header = decode_header(self.track_id)
+        return self._header
+
+    @property
+    def title(self) -> str:
+        return self.header["title"]
+
+    @property
+    def author(self) -> str:
+        return self.header["author"]
+
+    @property
+    def length(self) -> int:
+        return self.header["length"]
+
+    @property
+    def identifier(self) -> str:
+        return self.header["identifier"]
+
+    @property
+    def uri(self) -> Optional[str]:
+        return self.header["uri"]
+
+    @property
+    def is_stream(self) -> bool:
+        return self.header["isStream"]
+
+    @property
+    def source(self) -> str:
+        return self.header["sourceName"]
+
+    @property
+    def emoji(self) -> str:
+        return get_source(self.source, "emoji")
+
+    @property
+    def formatted_length(self) -> str:
+        return ctime(self.length)
+
+    def to_track(self, requester: Member = None, search_type: SearchType = SearchType.YOUTUBE) -> Track:
+        return Track(track_id=self.track_id, info=decode(self.track_id), requester=requester or self.requester, search_type=search_type)
+
 class Playlist:
     """The base playlist object.
        Returns critical playlist information needed for parsing by Lavalink.
@@ -149,10 +339,7 @@ class Playlist:
         self.thumbnail: str = None
         self.uri: str = None
         
-        self.tracks = [
-            Track(track_id=track["encoded"], info=track["info"], requester=requester)
-            for track in tracks
-        ]
+        self.tracks = Track.build_many(tracks, requester)
 
     def __str__(self) -> str:
         return self.name
@@ -163,3 +350,13 @@ class Playlist:
     @property
     def track_count(self) -> int:
         return len(self.tracks)
+
+    def copy(self, requester: Member, limit: Optional[int] = None) -> Playlist:
+        """Returns a playlist with the first `limit` tracks copied for another requester."""
+        item = Playlist.__new__(Playlist)
+        item.playlist_info = self.playlist_info
+        item.name = self.name
+        item.thumbnail = self.thumbnail
+        item.uri = self.uri
+        item.tracks = [track.copy(requester) for track in self.tracks[:limit]]
+        return item
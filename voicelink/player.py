@@ -24,10 +24,11 @@ SOFTWARE.
 import time, logging
 import function as func
 
-from math import ceil
+from math import ceil, isinf
 from asyncio import sleep
+from contextlib import asynccontextmanager
 from views import InteractiveController
-from typing import Any, Dict, List, Optional, Union, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Union, Tuple
 
 from discord import (
     Client,
@@ -45,15 +46,15 @@ from discord import (
 from discord.ext import commands
 
 from . import events
-from .enums import SearchType, LoopType, RequestMethod
+from .enums import SearchType, LoopType, RequestMethod, NodeAlgorithm
 from .events import VoicelinkEvent, TrackEndEvent, TrackStartEvent, TrackExceptionEvent
-from .exceptions import VoicelinkException, FilterInvalidArgument, TrackInvalidPosition, FilterTagAlreadyInUse, DuplicateTrack
+from .exceptions import VoicelinkException, FilterInvalidArgument, TrackInvalidPosition, FilterTagAlreadyInUse, DuplicateTrack, NoNodesAvailable
 from .filters import Filter, Filters
-from .objects import Track, Playlist
+from .objects import Track, LazyTrack, Playlist
 from .pool import Node, NodePool
 from .queue import Queue, FairQueue
 from .placeholders import Placeholders, build_embed
-from random import shuffle, choice
+from random import choice
 
 async def connect_channel(ctx: Union[commands.Context, Interaction], channel: VoiceChannel = None):
     texts = await func.get_lang(ctx.guild.id, "noChannel", "noPermission")
@@ -73,9 +74,6 @@ async def connect_channel(ctx: Union[commands.Context, Interaction], channel: Vo
             channel, ctx, settings
         ))
 
-    if player.volume != 100:
-        await player.set_volume(player.volume)
-
     if ctx.bot.ipc.is_connected:
         await player.send_ws({"op": "createPlayer", "memberIds": [str(member.id) for member in channel.members]})
 
@@ -115,9 +113,15 @@ class Player(VoiceProtocol):
         self.settings: dict = settings
         self.joinTime: float = round(time.time())
         self._volume: int = self.settings.get('volume', 100)
-        self.queue: Queue = eval(self.settings.get("queueType", "Queue"))(self.settings.get("maxQueue", func.settings.max_queue), self.settings.get("duplicateTrack", True), self.get_msg)
+        self.queue: Queue = eval(self.settings.get("queueType", "Queue"))(
+            self.settings.get("maxQueue", func.settings.max_queue),
+            self.settings.get("duplicateTrack", True),
+            self.get_msg,
+            self.settings.get("maxHistory", func.settings.max_history),
+            func.settings.max_spilled_history
+        )
 
-        self._node = NodePool.get_node()
+        self._node = self._get_best_node(channel.rtc_region if channel else None)
         self._current: Optional[Track] = None
         self._filters: Filters = Filters()
         self._paused: bool = False
@@ -132,6 +136,11 @@ class Player(VoiceProtocol):
 
         self._voice_state: dict = {}
 
+        # Player updates merged by batch_update(), sent as one PATCH when the batch ends.
+        self._pending_update: Dict[str, Any] = {}
+        self._pending_query: Optional[str] = None
+        self._batch_depth: int = 0
+
         self.controller: Union[Message, PartialMessage] = None
         self._updating: bool = False
 
@@ -307,9 +316,44 @@ class Player(VoiceProtocol):
         return build_embed(raw, self._ph)
 
     async def send(self, method: RequestMethod, query: str = None, data: Union[Dict, str] = {}) -> Dict:
-        """Sends an HTTP request to the node with the given method, query, and data."""
+        """Sends an HTTP request to the node with the given method, query, and data.
+           Inside batch_update(), PATCH requests are merged and sent when the batch ends.
+        """
+        if self._batch_depth:
+            if method == RequestMethod.PATCH:
+                self._pending_update.update(data)
+                self._pending_query = query or self._pending_query
+                return {}
+
+            # Keep the order of the requests, the pending update goes first.
+            await self._flush_update()
+
         uri: str = f"sessions/{self._node._session_id}/players/{self._guild.id}" + (f"?{query}" if query else "")
         return await self._node.send(method, query=uri, data=data)
+
+    async def _flush_update(self) -> None:
+        if not self._pending_update:
+            return
+
+        data, query = self._pending_update, self._pending_query
+        self._pending_update, self._pending_query = {}, None
+
+        uri: str = f"sessions/{self._node._session_id}/players/{self._guild.id}" + (f"?{query}" if query else "")
+        await self._node.send(RequestMethod.PATCH, query=uri, data=data)
+
+    @asynccontextmanager
+    async def batch_update(self) -> AsyncIterator[None]:
+        """Merges the player updates (track, position, pause, volume, filters and voice)
+           sent inside the block into a single PATCH, sent to the player's node when the
+           outermost batch ends. Later values of a field replace earlier ones.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                await self._flush_update()
         
     async def _update_state(self, data: dict) -> None:
         """Updates the player's state based on the provided data."""
@@ -328,6 +372,31 @@ class Player(VoiceProtocol):
                 "lastPosition": self._last_position
             })
 
+    def _sync_state(self, data: Optional[Dict[str, Any]]) -> bool:
+        """Updates the player from the node's copy of it after a resumed session.
+           Returns False when the node lost the player or its track, voice or pause state differs,
+           in which case the player has to be replayed.
+        """
+        if not data:
+            return False
+
+        track = data.get("track") or {}
+        if track.get("encoded") != (self._current.track_id if self._current else None):
+            return False
+
+        if data.get("paused", False) != self._paused:
+            return False
+
+        if self._voice_state.get("sessionId") and (data.get("voice") or {}).get("sessionId") != self._voice_state["sessionId"]:
+            return False
+
+        state: dict = data.get("state", {})
+        self._last_update = state.get("time", time.time() * 1000)
+        self._last_position = state.get("position", self._last_position)
+        self._is_connected = state.get("connected", self._is_connected)
+        self._ping = state.get("ping", self._ping)
+        return True
+
     async def _dispatch_voice_update(self, voice_data: Dict[str, Any] = None):
         """Dispatches a voice update to the node."""
         if {"sessionId", "event"} != self._voice_state.keys():
@@ -341,13 +410,40 @@ class Player(VoiceProtocol):
             "endpoint": state['event']['endpoint'],
             "sessionId": state['sessionId'],
         }
-        
-        await self.send(method=RequestMethod.PATCH, data={"voice": data})
+
+        # The volume goes along with the voice update, which creates the player on the node.
+        payload = {"voice": data}
+        if self._volume != 100:
+            payload["volume"] = self._volume
+
+        await self.send(method=RequestMethod.PATCH, data=payload)
         self._logger.debug(f"Player in {self.guild.name}({self.guild.id}) dispatched voice update to {state['event']['endpoint']} with data {data}")
 
+    def _get_best_node(self, region: Optional[str] = None) -> Node:
+        """Returns the best node for the player with the configured node algorithm."""
+        return NodePool.get_best_node(
+            algorithm=NodeAlgorithm.match(func.settings.node_algorithm) or NodeAlgorithm.BY_LOAD,
+            region=region,
+            guild_id=self._guild.id if self._guild else None
+        )
+
     async def on_voice_server_update(self, data: dict):
-        """Handles a voice server update event."""
+        """Handles a voice server update event.
+           Moves the player to a node serving the new voice region when the current one does not.
+        """
         self._voice_state.update({"event": data})
+
+        endpoint = data.get("endpoint")
+        if endpoint and not self._node.serves(endpoint):
+            try:
+                node = self._get_best_node(endpoint)
+            except NoNodesAvailable:
+                node = self._node
+
+            if node is not self._node and node.serves(endpoint):
+                self._logger.debug(f"Player in {self.guild.name}({self.guild.id}) is moving to node {node._identifier} for endpoint {endpoint}.")
+                return await self.change_node(node._identifier)
+
         await self._dispatch_voice_update(self._voice_state)
 
     async def on_voice_state_update(self, data: dict):
@@ -407,6 +503,9 @@ class Player(VoiceProtocol):
         self.shuffle_votes.clear()
         self.stop_votes.clear()
 
+        if self.queue.loops_back:
+            await self.queue.restore_spilled()
+
         track = self.queue.get()
 
         if not track:
@@ -428,6 +527,14 @@ class Player(VoiceProtocol):
         await self.invoke_controller()
         await self.update_voice_status()
 
+        if self.queue.pop_window_moved() and self.is_ipc_connected:
+            # Trimming or restoring the history shifted every index the dashboard holds.
+            await self.send_ws({
+                "op": "syncQueue",
+                "tracks": [{"trackId": queued.track_id, "requesterId": str(queued.requester.id)} for queued in self.queue._queue],
+                "queueDuration": None if isinf(duration := self.queue.tracks_length()) else duration
+            })
+
         if self.is_ipc_connected:
             await self.send_ws({
                 "op": "trackUpdate", 
@@ -521,14 +628,16 @@ class Player(VoiceProtocol):
         query: str,
         *,
         requester: Member,
-        search_type: SearchType = SearchType.YOUTUBE
+        search_type: SearchType = SearchType.YOUTUBE,
+        limit: Optional[int] = None
     ) -> Union[List[Track], Playlist]:
         """Fetches tracks from the node's REST api to parse into Lavalink.
 
         You can also pass in a discord.py Context object to get a
         Context object on any track you search.
+        Pass a limit to stop reading the response after that many tracks.
         """
-        return await self._node.get_tracks(query, requester=requester, search_type=search_type)
+        return await self._node.get_tracks(query, requester=requester, search_type=search_type, limit=limit)
 
     async def connect(self, *, timeout: float, reconnect: bool, self_deaf: bool = True, self_mute: bool = False):
         """Connects the player to a voice channel."""
@@ -615,37 +724,59 @@ class Player(VoiceProtocol):
             track.position = start_time
             track.end_time = end_time
 
-    async def add_track(self, raw_tracks: Union[Track, List[Track]], *, start_time: int = 0, end_time: int = 0, at_front: bool = False, duplicate: bool = True) -> int:
-        """Adds one or more tracks to the queue."""
-        tracks: List[Track] = []
-        _duplicate_tracks = [] if self.queue._allow_duplicate and duplicate else [track.uri for track in self.queue._queue]
+    async def add_track(self, raw_tracks: Union[Track, LazyTrack, List[Union[Track, LazyTrack]]], *, start_time: int = 0, end_time: int = 0, at_front: bool = False, duplicate: bool = True) -> int:
+        """Adds one or more tracks to the queue. Lazy tracks are built into full tracks here."""
+        if isinstance(raw_tracks, List):
+            # Only the tracks that fit are built, a full queue keeps one so QueueFull is still raised.
+            raw_tracks = [track.to_track() if isinstance(track, LazyTrack) else track for track in raw_tracks[:max(self.queue.space, 1)]]
+        elif isinstance(raw_tracks, LazyTrack):
+            raw_tracks = raw_tracks.to_track()
+
         raw_tracks = raw_tracks[0] if isinstance(raw_tracks, List) and len(raw_tracks) == 1 else raw_tracks
+        if isinstance(raw_tracks, List):
+            return await self.add_tracks_bulk(raw_tracks, start_time=start_time, end_time=end_time, at_front=at_front, duplicate=duplicate)
 
-        try:
-            if (is_list := isinstance(raw_tracks, List)):
-                for track in raw_tracks:
-                    if track.uri in _duplicate_tracks:
-                        continue
-
-                    self._validate_time(track, start_time, end_time)
-                    self.queue.put_at_front(track) if at_front else self.queue.put(track)  
-                    tracks.append(track)
-                    _duplicate_tracks.append(track.uri)
-            else:
-                if raw_tracks.uri in _duplicate_tracks:
-                    raise DuplicateTrack(self.get_msg("voicelinkDuplicateTrack"))
-                
-                self._validate_time(raw_tracks, start_time, end_time)
-                position = self.queue.put_at_front(raw_tracks) if at_front else self.queue.put(raw_tracks)
-                tracks.append(raw_tracks)
-                
-        finally:
-            if tracks:
-                if self.is_ipc_connected:
-                    await self.send_ws({"op": "addTrack", "tracks": [track.track_id for track in tracks], "position": -1 if is_list else position}, tracks[0].requester)
+        if not (self.queue._allow_duplicate and duplicate) and raw_tracks in self.queue:
+            raise DuplicateTrack(self.get_msg("voicelinkDuplicateTrack"))
+
+        self._validate_time(raw_tracks, start_time, end_time)
+        position = self.queue.put_at_front(raw_tracks) if at_front else self.queue.put(raw_tracks)
+
+        if self.is_ipc_connected:
+            await self.send_ws({"op": "addTrack", "tracks": [raw_tracks.track_id], "position": position}, raw_tracks.requester)
+
+        self._logger.debug(f"Player in {self.guild.name}({self.guild.id}) has been added 1 tracks into the queue.")
+        return position
+
+    async def add_tracks_bulk(self, raw_tracks: List[Track], *, start_time: int = 0, end_time: int = 0, at_front: bool = False, duplicate: bool = True) -> int:
+        """Adds a batch of tracks to the queue with a single validation pass and a single queue update."""
+        tracks: List[Track] = []
+        check_duplicate = not (self.queue._allow_duplicate and duplicate)
+        identities = set()
+
+        for track in raw_tracks:
+            if check_duplicate:
+                if track in self.queue or track.identity in identities:
+                    continue
+                identities.add(track.identity)
+
+            try:
+                self._validate_time(track, start_time, end_time)
+            except VoicelinkException:
+                if not tracks:
+                    raise
+                break
+            tracks.append(track)
+
+        if not tracks:
+            return 0
+
+        tracks = self.queue.put_many(tracks, at_front=at_front)
+        if self.is_ipc_connected:
+            await self.send_ws({"op": "addTrack", "tracks": [track.track_id for track in tracks], "position": -1}, tracks[0].requester)
 
-                self._logger.debug(f"Player in {self.guild.name}({self.guild.id}) has been added {len(tracks)} tracks into the queue.")
-                return len(tracks) if is_list else position
+        self._logger.debug(f"Player in {self.guild.name}({self.guild.id}) has been added {len(tracks)} tracks into the queue.")
+        return len(tracks)
     
     async def remove_track(self, index: int, index2: int = None, remove_target: Member = None, requester: Member = None) -> Dict[int, Track]:
         """Removes one or more tracks from the queue."""
@@ -700,22 +831,36 @@ class Player(VoiceProtocol):
 
     async def shuffle(self, queue_type: str, requester: Member = None) -> None:
         """Shuffles the tracks in the specified queue or history."""
-        replacement = self.queue.tracks() if queue_type == "queue" else self.queue.history()
-        if len(replacement) < 3:
+        count = self.queue.count if queue_type == "queue" else self.queue.history_count
+        if count < 3:
             raise VoicelinkException(self.get_msg('shuffleError'))
         
-        shuffle(replacement)
-        self.queue.replace(queue_type, replacement)
+        permutation = self.queue.shuffle(queue_type)
         self.shuffle_votes.clear()
         if self.is_ipc_connected:
             await self.send_ws({
                 "op": "shuffleTrack",
-                "tracks": [{"trackId": track.track_id, "requesterId": str(track.requester.id)} for track in replacement],
+                "permutation": permutation,
                 "queueType": queue_type
             }, requester)
         
         self._logger.debug(f"Player in {self.guild.name}({self.guild.id}) has been shuffled the queue.")
 
+    async def unshuffle(self, queue_type: str, requester: Member = None) -> None:
+        """Restores the order the tracks had before they were shuffled."""
+        permutation = self.queue.unshuffle(queue_type)
+        if permutation is None:
+            raise VoicelinkException(self.get_msg('shuffleError'))
+
+        if self.is_ipc_connected:
+            await self.send_ws({
+                "op": "shuffleTrack",
+                "permutation": permutation,
+                "queueType": queue_type
+            }, requester)
+
+        self._logger.debug(f"Player in {self.guild.name}({self.guild.id}) has been unshuffled the queue.")
+
     async def swap_track(self, index1: int, index2: int, requester: Member = None) -> Tuple[Track, Track]:
        """Swaps two tracks in the queue at the specified indices."""
        track1, track2 = self.queue.swap(index1, index2)
@@ -760,9 +905,10 @@ class Player(VoiceProtocol):
             raise FilterTagAlreadyInUse(self.get_msg("FilterTagAlreadyInUse"))
         
         payload = self._filters.get_all_payloads()
-        await self.send(method=RequestMethod.PATCH, data={"filters": payload})
-        if fast_apply:
-            await self.seek(self.position)
+        async with self.batch_update():
+            await self.send(method=RequestMethod.PATCH, data={"filters": payload})
+            if fast_apply:
+                await self.seek(self.position)
         
         if self.is_ipc_connected:
             await self.send_ws({
@@ -791,9 +937,10 @@ class Player(VoiceProtocol):
     async def remove_filter(self, filter_tag: str, requester: Member = None, fast_apply: bool = False) -> Filters:
         self._filters.remove_filter(filter_tag=filter_tag)
         payload = self._filters.get_all_payloads()
-        await self.send(method=RequestMethod.PATCH, data={"filters": payload})
-        if fast_apply:
-            await self.seek(self.position)
+        async with self.batch_update():
+            await self.send(method=RequestMethod.PATCH, data={"filters": payload})
+            if fast_apply:
+                await self.seek(self.position)
         
         if self.is_ipc_connected:
             await self.send_ws({
@@ -811,9 +958,10 @@ class Player(VoiceProtocol):
             raise FilterInvalidArgument("You must have filters applied first in order to use this method.")
         
         self._filters.reset_filters()
-        await self.send(method=RequestMethod.PATCH, data={"filters": {}})
-        if fast_apply:
-            await self.seek(self.position)
+        async with self.batch_update():
+            await self.send(method=RequestMethod.PATCH, data={"filters": {}})
+            if fast_apply:
+                await self.seek(self.position)
 
         if self.is_ipc_connected:
             await self.send_ws({
@@ -830,18 +978,25 @@ class Player(VoiceProtocol):
         except:
             return await self.teardown()
 
-        self._node._players.pop(self.guild.id)
+        # Destroy the player on the old node, it would keep the voice connection otherwise.
+        try:
+            await self.send(method=RequestMethod.DELETE)
+        except Exception as e:
+            self._logger.debug(f"Player in {self.guild.name}({self.guild.id}) failed to be destroyed on node {self._node._identifier}.", exc_info=e)
+
+        self._node._players.pop(self.guild.id, None)
         self._node = node
         self._node._players[self.guild.id] = self
 
-        await self._dispatch_voice_update(self._voice_state)
+        async with self.batch_update():
+            await self._dispatch_voice_update(self._voice_state)
 
-        if self.current:
-            await self.play(self.current, start=self.position)
-            self._last_update = time.time() * 1000
+            if self.current:
+                await self.play(self.current, start=self.position)
+                self._last_update = time.time() * 1000
 
-            if self.is_paused:
-                await self.set_pause(True)
+                if self.is_paused:
+                    await self.set_pause(True)
     
     async def get_recommendations(self, *, track: Optional[Track] = None) -> bool:
         """Get recommendations from Youtube or Spotify."""
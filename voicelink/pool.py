@@ -24,14 +24,18 @@ SOFTWARE.
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import os
 import re
+import time
 import aiohttp
 import logging
 
+from collections import OrderedDict
+from math import inf
 from discord import Client, Member
 from discord.ext.commands import Bot
-from typing import Dict, Optional, Union, List, Any, TYPE_CHECKING
+from typing import Awaitable, Callable, Dict, Optional, Set, Union, List, Any, TYPE_CHECKING
 from urllib.parse import quote
 
 from . import (
@@ -48,9 +52,10 @@ from .exceptions import (
     TrackLoadError
 )
 from .objects import Playlist, Track
-from .utils import ExponentialBackoff, NodeStats, NodeInfo, Ping
-from .enums import RequestMethod
-from .ratelimit import YTRatelimit, YTToken, STRATEGY
+from .transformer import decode
+from .utils import ExponentialBackoff, NodeStats, NodeInfo, LatencySampler, JSONStream, VOICE_REGIONS, voice_region, extract_domain
+from .enums import RequestMethod, RequestPriority
+from .ratelimit import YTRatelimit, YTToken, STRATEGY, RequestScheduler
 
 if TYPE_CHECKING:
     from .player import Player
@@ -60,6 +65,112 @@ URL_REGEX = re.compile(
 )
 
 NODE_VERSION = "v4"
+DECODE_BATCH_SIZE = 200
+
+# The source behind each search prefix, used to pick the token bucket of a loadtracks request.
+SEARCH_SOURCES: Dict[str, str] = {
+    "ytsearch": "youtube",
+    "ytmsearch": "youtube",
+    "spsearch": "spotify",
+    "sprec": "spotify",
+    "scsearch": "soundcloud",
+    "amsearch": "apple",
+    "dzsearch": "deezer"
+}
+
+# Prefixes followed by free text, the other prefixes (like sprec:seed_tracks=<id>) are followed by ids.
+TEXT_SEARCH_PREFIXES: Set[str] = {"ytsearch", "ytmsearch", "spsearch", "scsearch", "amsearch", "dzsearch"}
+
+class SearchCache:
+    """A LRU cache with expiry for the results of Node.get_tracks, shared by every node.
+       Results are kept without a requester and copied for each caller, so identical
+       queries from different guilds are loaded from Lavalink only once per ttl.
+    """
+
+    def __init__(self, max_size: int = 1024, search_ttl: float = 300, url_ttl: float = 3600):
+        self.max_size: int = max_size
+        self.search_ttl: float = search_ttl
+        self.url_ttl: float = url_ttl
+
+        # key -> (expires at, limit the result was loaded with, template)
+        self._entries: OrderedDict[tuple, tuple] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"<Voicelink.SearchCache size={len(self)} hits={self.hits} misses={self.misses}>"
+
+    @staticmethod
+    def key(query: str, search_type: SearchType) -> tuple:
+        """Normalizes a query, free text searches ignore case and repeated spaces while urls and ids are kept as they are."""
+        query = query.strip()
+        prefix, separator, text = query.partition(":")
+        if separator and prefix in TEXT_SEARCH_PREFIXES:
+            query = f"{prefix}:{' '.join(text.casefold().split())}"
+        elif not separator:
+            query = " ".join(query.casefold().split())
+        return (query, search_type)
+
+    def get(self, key: tuple, requester: Member, limit: Optional[int] = None) -> Optional[Union[List[Track], Playlist]]:
+        """Returns a copy of the cached result for the requester, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, loaded_limit, template = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+
+            # A result read with a smaller limit can't answer a larger request.
+            elif loaded_limit is None or (limit is not None and limit <= loaded_limit):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                if isinstance(template, Playlist):
+                    return template.copy(requester, limit)
+                return [track.copy(requester) for track in template[:limit]]
+
+        self.misses += 1
+        return None
+
+    def put(self, key: tuple, result: Union[List[Track], Playlist], limit: Optional[int] = None) -> None:
+        """Stores a result, playlists and direct urls are kept for url_ttl and searches for search_ttl."""
+        if self.max_size <= 0:
+            return
+
+        if isinstance(result, Playlist):
+            template = result.copy(None)
+        else:
+            template = tuple(track.copy(None) for track in result)
+
+        # Fewer tracks than the limit means the whole response was read.
+        if limit is not None and len(template.tracks if isinstance(template, Playlist) else template) < limit:
+            limit = None
+        ttl = self.url_ttl if isinstance(result, Playlist) or URL_REGEX.match(key[0]) else self.search_ttl
+
+        self._entries[key] = (time.monotonic() + ttl, limit, template)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the cache metrics."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
 
 class Node:
     """The base class for a node. 
@@ -80,6 +191,9 @@ class Node:
         yt_ratelimit: dict = None,
         session: Optional[aiohttp.ClientSession] = None,
         resume_key: Optional[str] = None,
+        resume_timeout: int = 60,
+        regions: Optional[List[str]] = None,
+        scheduler: Optional[dict] = None,
         logger: Optional[logging.Logger] = None
     ):
         self._bot: Bot = bot
@@ -90,6 +204,8 @@ class Node:
         self._identifier: str = identifier
         self._heartbeat: int = heartbeat
         self._secure: bool = secure
+        self._regions: Set[str] = {region.lower() for region in regions or []}
+        self._region_groups: Set[str] = {VOICE_REGIONS.get(region, region) for region in self._regions}
         self._logger: Optional[logging.Logger] = logger
 
         self._websocket_uri: str = f"{'wss' if self._secure else 'ws'}://{self._host}:{self._port}/" + NODE_VERSION + "/websocket"
@@ -100,18 +216,25 @@ class Node:
         self._task: asyncio.Task = None
 
         self.resume_key: str = resume_key or str(os.urandom(8).hex())
+        self.resume_timeout: int = resume_timeout
         self._session_id: str = None
+        self._resumed: bool = False
+        self._ready: asyncio.Event = asyncio.Event()
         self._available: bool = None
 
         self._headers: Dict[str, str] = {
             "Authorization": self._password,
             "User-Id": str(bot.user.id),
-            "Client-Name": f"Voicelink/{__version__}",
-            'Resume-Key': self.resume_key
+            "Client-Name": f"Voicelink/{__version__}"
         }
 
         self._players: Dict[int, Player] = {}
         self._info: Optional[NodeInfo] = None
+        self._stats: Optional[NodeStats] = None
+        self._latency: LatencySampler = LatencySampler(self._host, self._port)
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+        self._scheduler: RequestScheduler = RequestScheduler(scheduler)
+        self._coalesced: int = 0
         
         self.yt_ratelimit: Optional[YTRatelimit] = STRATEGY.get(yt_ratelimit.get("strategy"))(self, yt_ratelimit) if yt_ratelimit else None
 
@@ -138,6 +261,30 @@ class Node:
         """Property which returns the node stats."""
         return self._stats
 
+    @property
+    def regions(self) -> Set[str]:
+        """Property which returns the voice regions and region groups this node serves"""
+        return self._regions
+
+    def serves(self, region: Optional[str]) -> bool:
+        """Returns whether the node declared the voice region, or a region of the same group.
+           A node declaring "us-east" serves "c-iad..." endpoints, since both are in the "us" group.
+        """
+        region = voice_region(region)
+        return bool(region) and (region in self._regions or VOICE_REGIONS.get(region) in self._region_groups)
+
+    def affinity(self, guild_id: int) -> int:
+        """Returns the rendezvous hashing weight of the guild on this node, higher is preferred."""
+        digest = hashlib.blake2b(f"{self._identifier}:{guild_id}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big")
+
+    @property
+    def penalty(self) -> float:
+        """Property which returns the load penalty of the node, lower is better.
+           Falls back to the player count until the node has sent its stats.
+        """
+        return self._stats.penalty if self._stats else float(self.player_count)
+
     @property
     def players(self) -> Dict[int, Player]:
         """Property which returns a dict containing the guild ID and the player object."""
@@ -160,8 +307,25 @@ class Node:
 
     @property
     def latency(self) -> float:
-        """Property which returns the latency of the node"""
-        return Ping(self._host, port=self._port).get_ping()
+        """Property which returns the averaged latency of the node in milliseconds.
+           Returns inf until the first sample is taken.
+        """
+        return self._latency.average if self._latency.average is not None else inf
+
+    @property
+    def latency_sampler(self) -> LatencySampler:
+        """Property which returns the background sampler behind the node latency."""
+        return self._latency
+
+    @property
+    def scheduler(self) -> RequestScheduler:
+        """Property which returns the scheduler of the node's REST requests."""
+        return self._scheduler
+
+    @property
+    def coalesced_requests(self) -> int:
+        """Property which returns how many requests were answered by an identical request already in flight."""
+        return self._coalesced
 
     async def _update_handler(self, data: dict) -> None:
         await self._bot.wait_until_ready()
@@ -232,6 +396,8 @@ class Node:
 
         if op == "ready":
             self._session_id = data.get("sessionId")
+            self._resumed = data.get("resumed", False)
+            self._ready.set()
 
         if op == "stats":
             self._stats = NodeStats(data)
@@ -246,12 +412,62 @@ class Node:
         elif op == "playerUpdate":
             await player._update_state(data)
 
-    async def send(self, method: RequestMethod, query: str, data: Union[dict, str] = {}) -> dict:
+    def _release(self, key: tuple, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+        # Mark the error as retrieved when every caller was cancelled before it finished.
+        if not task.cancelled():
+            task.exception()
+
+    async def _single_flight(self, key: tuple, request: Callable[[], Awaitable[Any]]) -> Any:
+        """Runs the request once for every concurrent caller with the same key.
+           The request runs in its own task, so a caller being cancelled doesn't cancel it
+           for the others. The result is shared between the callers and must not be modified.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(request())
+            task.add_done_callback(lambda task: self._release(key, task))
+        else:
+            self._coalesced += 1
+
+        return await asyncio.shield(task)
+
+    async def send(
+        self,
+        method: RequestMethod,
+        query: str,
+        data: Union[dict, list, str] = {},
+        *,
+        priority: Optional[RequestPriority] = None,
+        source: Optional[str] = None
+    ) -> Any:
+        """Sends a request to the node's REST api through the node's scheduler.
+           Player updates (PATCH and DELETE) are interactive unless a priority is given
+           or set with RequestScheduler.priority(), the rest are normal.
+           Concurrent GET requests to the same path share a single request.
+        """
+        priority = priority or RequestScheduler.current_priority(
+            RequestPriority.INTERACTIVE if method in (RequestMethod.PATCH, RequestMethod.DELETE) else RequestPriority.NORMAL
+        )
+        if method == RequestMethod.GET:
+            return await self._single_flight((method, query), lambda: self._request(method, query, data, priority, source))
+        return await self._request(method, query, data, priority, source)
+
+    async def _request(
+        self,
+        method: RequestMethod,
+        query: str,
+        data: Union[dict, list, str],
+        priority: RequestPriority,
+        source: Optional[str] = None
+    ) -> Any:
         if not self._available:
             raise NodeNotAvailable(f"The node '{self._identifier}' is unavailable.")
         
         uri: str = f"{self._rest_uri}/{NODE_VERSION}/{query}"
-        async with self._session.request(
+        async with self._scheduler.slot(priority, source), self._session.request(
             method=method.value,
             url=uri,
             headers={"Authorization": self._password},
@@ -265,6 +481,67 @@ class Node:
 
             return await resp.json()
 
+    async def _read_tracks(self, stream: JSONStream, limit: int) -> List[dict]:
+        tracks: List[dict] = []
+        if limit <= 0:
+            return tracks
+
+        async for track in stream.elements():
+            tracks.append(track)
+            if len(tracks) >= limit:
+                break
+        return tracks
+
+    async def load_tracks(
+        self,
+        query: str,
+        limit: int,
+        *,
+        priority: Optional[RequestPriority] = None,
+        source: Optional[str] = None
+    ) -> dict:
+        """Streams a loadtracks response and stops reading once `limit` tracks are parsed.
+           The rest of the body is never downloaded or decoded.
+           Concurrent loads of the same query and limit share a single request.
+        """
+        priority = priority or RequestScheduler.current_priority()
+        return await self._single_flight(("loadtracks", query, limit), lambda: self._load_tracks(query, limit, priority, source))
+
+    async def _load_tracks(self, query: str, limit: int, priority: RequestPriority, source: Optional[str] = None) -> dict:
+        if not self._available:
+            raise NodeNotAvailable(f"The node '{self._identifier}' is unavailable.")
+
+        uri: str = f"{self._rest_uri}/{NODE_VERSION}/loadtracks?identifier={quote(query)}"
+        async with self._scheduler.slot(priority, source), self._session.request(
+            method=RequestMethod.GET.value,
+            url=uri,
+            headers={"Authorization": self._password}
+        ) as resp:
+            if resp.status >= 300:
+                raise NodeException(f"Getting errors from Lavalink REST api")
+
+            # Lavalink writes loadType before data, so the data can be streamed by type.
+            stream = JSONStream(resp.content)
+            response: Dict[str, Any] = {}
+            async for key in stream.items():
+                load_type = response.get("loadType")
+                if key == "data" and load_type == "search":
+                    response["data"] = await self._read_tracks(stream, limit)
+                    return response
+
+                elif key == "data" and load_type in ("playlist", "recommendations"):
+                    data = response["data"] = {}
+                    async for field in stream.items():
+                        if field == "tracks":
+                            data["tracks"] = await self._read_tracks(stream, limit)
+                            return response
+                        data[field] = await stream.value()
+
+                else:
+                    response[key] = await stream.value()
+
+            return response
+
     async def connect(self) -> Node:
         """Initiates a connection with a Lavalink node and adds it to the node pool."""
 
@@ -273,12 +550,22 @@ class Node:
                 self._logger.info(f"Node [{self._identifier}] already connected.")
                 return
             
+            # Sending the last session id asks the node to resume it.
+            headers = {**self._headers, "Session-Id": self._session_id} if self._session_id else self._headers
+            self._ready.clear()
             self._websocket = await self._session.ws_connect(
-                self._websocket_uri, headers=self._headers, heartbeat=self._heartbeat
+                self._websocket_uri, headers=headers, heartbeat=self._heartbeat
             )
 
             self._task = self._bot.loop.create_task(self._listen())
             self._available = True
+            self._latency.start()
+            await asyncio.wait_for(self._ready.wait(), timeout=10)
+
+            # Keep the players on the node while the websocket is down, for up to resume_timeout seconds.
+            if not self._resumed:
+                await self.send(RequestMethod.PATCH, f"sessions/{self._session_id}", {"resuming": True, "timeout": self.resume_timeout})
+
             self._info = NodeInfo(await self.send(RequestMethod.GET, query="info"))
             
             self._logger.info(f"Node [{self._identifier}] is connected!")
@@ -295,6 +582,15 @@ class Node:
             raise NodeConnectionFailure(
                 f"The URI for node '{self._identifier}' is invalid."
             )
+        except asyncio.TimeoutError:
+            # Undo the connection, so the listener's reconnect loop keeps retrying.
+            self._available = False
+            self._task.cancel()
+            self._latency.stop()
+            await self._websocket.close()
+            raise NodeConnectionFailure(
+                f"The node '{self._identifier}' didn't send a ready message."
+            )
         
         if self.players:
             await self.reconnect()
@@ -313,14 +609,41 @@ class Node:
             del self._pool._nodes[self._identifier]
         self._available = False
         self._task.cancel()
+        self._latency.stop()
         
         self._logger.info(f"Node [{self._identifier}] is disconnected!")
 
     async def reconnect(self) -> None:
-        await asyncio.sleep(10)
-        for player in self.players.copy().values():
-            await asyncio.sleep(3)
-            try:
+        """Brings the players back in sync after the websocket reconnected.
+           When the session was resumed, the node's players are authoritative: the players it
+           still has in the same state are only updated from it, and the rest are replayed.
+           The node's players without a local player are destroyed.
+        """
+        with RequestScheduler.priority(RequestPriority.BULK):
+            remote_players: Dict[int, dict] = {}
+            if self._resumed:
+                try:
+                    remote_players = {
+                        int(data["guildId"]): data
+                        for data in await self.send(RequestMethod.GET, f"sessions/{self._session_id}/players")
+                    }
+                except (NodeException, NodeNotAvailable, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    self._logger.warning(f"Node [{self._identifier}] failed to fetch its players, replaying all of them.", exc_info=e)
+
+            players = self.players.copy()
+            replays = [player for guild_id, player in players.items() if not player._sync_state(remote_players.get(guild_id))]
+            stale = [guild_id for guild_id in remote_players if guild_id not in players]
+
+            self._logger.info(f"Node [{self._identifier}] {'resumed' if self._resumed else 'started'} a session, replaying {len(replays)} of {len(players)} players.")
+            await asyncio.gather(
+                *(self._replay_player(player) for player in replays),
+                *(self.send(RequestMethod.DELETE, f"sessions/{self._session_id}/players/{guild_id}") for guild_id in stale),
+                return_exceptions=True
+            )
+
+    async def _replay_player(self, player: Player) -> None:
+        try:
+            async with player.batch_update():
                 if player._voice_state:
                     await player._dispatch_voice_update(player._voice_state)
 
@@ -329,9 +652,8 @@ class Node:
 
                     if player.is_paused:
                         await player.set_pause(True)
-            except:
-                await player.teardown()
-            await asyncio.sleep(2)
+        except:
+            await player.teardown()
 
     async def build_track(
         self,
@@ -348,24 +670,89 @@ class Node:
         data = await self.send(RequestMethod.GET, f"decodetrack?encodedTrack={identifier}")
         return Track(track_id=identifier, info=data, requester=requester)
 
+    async def build_tracks(
+        self,
+        identifiers: List[str],
+        requester: Member = None,
+        *,
+        local_first: bool = False,
+        priority: RequestPriority = RequestPriority.BULK
+    ) -> List[Optional[Track]]:
+        """
+        Builds tracks from a list of track identifiers with the decodetracks endpoint,
+        DECODE_BATCH_SIZE identifiers per request.
+
+        A batch the node fails to decode is decoded locally instead. With local_first,
+        the identifiers are decoded locally and only the ones that fail are sent to the
+        node, which saves the round trip for interactive callers. The tracks are returned
+        in the order of the identifiers, with None for any identifier that couldn't be
+        decoded either way.
+        """
+        tracks: List[Optional[Track]] = [None] * len(identifiers)
+        pending: List[int] = []
+        for index, identifier in enumerate(identifiers):
+            if not local_first:
+                pending.append(index)
+                continue
+            try:
+                tracks[index] = Track(track_id=identifier, info=decode(identifier), requester=requester)
+            except Exception:
+                pending.append(index)
+
+        for start in range(0, len(pending), DECODE_BATCH_SIZE):
+            batch = pending[start:start + DECODE_BATCH_SIZE]
+            try:
+                data = await self.send(RequestMethod.POST, "decodetracks", [identifiers[index] for index in batch], priority=priority)
+                if len(data) != len(batch):
+                    raise NodeException("The decodetracks response doesn't match the request.")
+                for index, track in zip(batch, Track.build_many(data, requester)):
+                    tracks[index] = track
+
+            except (NodeException, NodeNotAvailable, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self._logger.debug(f"Node [{self._identifier}] failed to decode {len(batch)} tracks.", exc_info=e)
+                if local_first:
+                    continue
+
+                for index in batch:
+                    try:
+                        tracks[index] = Track(track_id=identifiers[index], info=decode(identifiers[index]), requester=requester)
+                    except Exception:
+                        pass
+
+        return tracks
+
     async def get_tracks(
         self,
         query: str,
         *,
         requester: Member,
-        search_type: SearchType = SearchType.YOUTUBE
+        search_type: SearchType = SearchType.YOUTUBE,
+        limit: Optional[int] = None,
+        priority: Optional[RequestPriority] = None
     ) -> Union[List[Track], Playlist]:
         """
         Fetches tracks from the node's REST api to parse into Lavalink.
 
         You can also pass in a discord.py Context object to get a
         Context object on any track you search.
+
+        With a limit, the response is parsed while it streams in and
+        at most that many tracks are read and built.
         """
 
         if not URL_REGEX.match(query) and ':' not in query:
             query = f"{search_type}:{query}"
 
-        response: dict[str, Any] = await self.send(RequestMethod.GET, f"loadtracks?identifier={quote(query)}")
+        cache_key = SearchCache.key(query, search_type)
+        cached = self._pool.search_cache.get(cache_key, requester, limit)
+        if cached is not None:
+            return cached
+
+        source = extract_domain(query) if URL_REGEX.match(query) else SEARCH_SOURCES.get(query.split(":", 1)[0])
+        if limit is None:
+            response: dict[str, Any] = await self.send(RequestMethod.GET, f"loadtracks?identifier={quote(query)}", priority=priority, source=source)
+        else:
+            response: dict[str, Any] = await self.load_tracks(query, limit, priority=priority, source=source)
         data = response.get("data")
         load_type = response.get("loadType")
 
@@ -379,13 +766,19 @@ class Node:
             raise TrackLoadError(f"{data['message']} [{data['severity']}]")
 
         elif load_type in ("playlist", "recommendations"):
-            return Playlist(playlist_info=data["info"], tracks=data["tracks"], requester=requester)
+            result = Playlist(playlist_info=data["info"], tracks=data["tracks"], requester=requester)
 
         elif load_type == "search":
-            return [Track(track_id=track["encoded"], info=track["info"], requester=requester) for track in data]
+            result = Track.build_many(data, requester)
 
         elif load_type == "track":
-            return [Track(track_id=data["encoded"], info=data["info"], requester=requester)]
+            result = [Track(track_id=data["encoded"], info=data["info"], requester=requester)]
+
+        else:
+            return None
+
+        self._pool.search_cache.put(cache_key, result, limit)
+        return result
 
     async def get_recommendations(self, track: Track, limit: int = 20) -> List[Optional[Track]]:
         query = ""
@@ -398,7 +791,7 @@ class Node:
         if not query:
             return []
         
-        tracks = await self.get_tracks(query=query, requester=self.bot.user)
+        tracks = await self.get_tracks(query=query, requester=self.bot.user, priority=RequestPriority.BULK)
         if isinstance(tracks, Playlist):
             tracks = tracks.tracks
 
@@ -424,6 +817,7 @@ class NodePool:
     """
 
     _nodes: Dict[str, Node] = {}
+    search_cache: SearchCache = SearchCache()
 
     def __repr__(self):
         return f"<Voicelink.NodePool node_count={self.node_count}>"
@@ -438,7 +832,7 @@ class NodePool:
         return len(self._nodes.values())
     
     @classmethod
-    def get_best_node(cls, *, algorithm: NodeAlgorithm) -> Node:
+    def get_best_node(cls, *, algorithm: NodeAlgorithm, region: Optional[str] = None, guild_id: Optional[int] = None) -> Node:
         """Fetches the best node based on an NodeAlgorithm.
          This option is preferred if you want to choose the best node
          from a multi-node setup using either the node's latency
@@ -448,16 +842,38 @@ class NodePool:
          Use NodeAlgorithm.by_region if you want to get the best node
          based on the node's voice region. This method will only work
          if you set a voice region when you create a node.
+         When a region (a Discord rtc_region or voice endpoint) is given, the
+         nodes that serve it are preferred and the one with the lowest latency
+         is returned. Without a match, BY_REGION falls back to BY_LOAD and any
+         other algorithm is applied to all nodes.
+         Use NodeAlgorithm.BY_AFFINITY with a guild_id if you want the guild
+         to stay on the same node across sessions. Nodes are ranked with
+         rendezvous hashing, so a node joining or leaving only moves its own
+         share of guilds. Without a guild_id it falls back to BY_LOAD.
          Use NodeAlgorithm.BY_PLAYERS if you want to get the best node
          based on how players it has. This method will return a node with
          the least amount of players
+         Use NodeAlgorithm.BY_LOAD if you want to get the best node
+         based on the stats the node reports. This method will return
+         the node with the lowest load penalty.
         """
         available_nodes = [node for node in cls._nodes.values() if node._available]
 
         if not available_nodes:
             raise NoNodesAvailable("There are no nodes available.")
 
-        if algorithm == NodeAlgorithm.BY_PING:
+        regional_nodes = [node for node in available_nodes if node.serves(region)]
+        if algorithm == NodeAlgorithm.BY_AFFINITY and guild_id is not None:
+            return max(regional_nodes or available_nodes, key=lambda node: node.affinity(guild_id))
+
+        if regional_nodes:
+            return min(regional_nodes, key=lambda node: (node.latency, node.penalty))
+
+        if algorithm in (NodeAlgorithm.BY_LOAD, NodeAlgorithm.BY_REGION, NodeAlgorithm.BY_AFFINITY):
+            tested_nodes = {node: node.penalty for node in available_nodes}
+            return min(tested_nodes, key=tested_nodes.get)
+
+        elif algorithm == NodeAlgorithm.BY_PING:
             tested_nodes = {node: node.latency for node in available_nodes}
             return min(tested_nodes, key=tested_nodes.get)
 
@@ -498,6 +914,9 @@ class NodePool:
         yt_ratelimit: dict = None,
         session: Optional[aiohttp.ClientSession] = None,
         resume_key: Optional[str] = None,
+        resume_timeout: int = 60,
+        regions: Optional[List[str]] = None,
+        scheduler: Optional[dict] = None,
         logger: Optional[logging.Logger] = None
     ) -> Node:
         """Creates a Node object to be then added into the node pool.
@@ -511,7 +930,8 @@ class NodePool:
         node = Node(
             pool=cls, bot=bot, host=host, port=port, password=password,
             identifier=identifier, secure=secure, heartbeat=heartbeat, yt_ratelimit=yt_ratelimit,
-            session=session, resume_key=resume_key, logger=logger
+            session=session, resume_key=resume_key, resume_timeout=resume_timeout,
+            regions=regions, scheduler=scheduler, logger=logger
         )
 
         await node.connect()
@@ -24,9 +24,15 @@ SOFTWARE.
 from .exceptions import QueueFull, OutofList
 from .objects import Track
 from .enums import LoopType
+from .transformer import decode
 
-from typing import Optional, Tuple, Callable, Dict, List
+import asyncio
+
+from math import inf
+from random import Random
+from typing import Any, Optional, Tuple, Callable, Deque, Dict, Iterator, List
 from itertools import cycle
+from collections import deque
 from discord import Member
 
 class LoopTypeCycle:
@@ -51,17 +57,117 @@ class LoopTypeCycle:
     def __str__(self) -> str:
         return self.current.name.capitalize()
 
+class LengthTree:
+    """A Fenwick tree over the track lengths of a queue.
+       Streams are counted in a second tree, since a range holding one has no end.
+       Tracks dropped from the front are zeroed and skipped with an offset, and the tree is
+       rebuilt once the dead prefix outgrows the live part.
+    """
+
+    __slots__ = ("_lengths", "_streams", "_offset")
+
+    def __init__(self, tracks: List[Track]) -> None:
+        self._offset: int = 0
+        self._lengths: List[int] = [0] * (len(tracks) + 1)
+        self._streams: List[int] = [0] * (len(tracks) + 1)
+
+        for index, track in enumerate(tracks, start=1):
+            self._lengths[index] += self._length(track)
+            self._streams[index] += track.is_stream
+            parent = index + (index & -index)
+            if parent <= len(tracks):
+                self._lengths[parent] += self._lengths[index]
+                self._streams[parent] += self._streams[index]
+
+    def __len__(self) -> int:
+        return len(self._lengths) - 1 - self._offset
+
+    @staticmethod
+    def _length(track: Track) -> int:
+        return 0 if track.is_stream else track.length or 0
+
+    def _add(self, index: int, length: int, stream: int) -> None:
+        index += 1
+        while index < len(self._lengths):
+            self._lengths[index] += length
+            self._streams[index] += stream
+            index += index & -index
+
+    def _prefix(self, index: int) -> Tuple[int, int]:
+        length = stream = 0
+        while index > 0:
+            length += self._lengths[index]
+            stream += self._streams[index]
+            index -= index & -index
+        return length, stream
+
+    def append(self, track: Track) -> None:
+        index = len(self._lengths)
+        length, stream = self._prefix(index - 1)
+        lower_length, lower_stream = self._prefix(index - (index & -index))
+        self._lengths.append(self._length(track) + length - lower_length)
+        self._streams.append(track.is_stream + stream - lower_stream)
+
+    def replace(self, index: int, old: Track, new: Track) -> None:
+        self._add(self._offset + index, self._length(new) - self._length(old), new.is_stream - old.is_stream)
+
+    def drop_front(self, tracks: List[Track]) -> None:
+        for index, track in enumerate(tracks):
+            self._add(self._offset + index, -self._length(track), -track.is_stream)
+        self._offset += len(tracks)
+
+    def truncate(self, length: int) -> None:
+        del self._lengths[self._offset + length + 1:]
+        del self._streams[self._offset + length + 1:]
+
+    def sum(self, start: int, stop: int) -> float:
+        """Returns the total length of the tracks in [start, stop)."""
+        if stop <= start:
+            return 0
+
+        length, stream = self._prefix(self._offset + stop)
+        lower_length, lower_stream = self._prefix(self._offset + start)
+        return inf if stream - lower_stream else length - lower_length
+
 class Queue:
-    def __init__(self, size: int, allow_duplicate: bool, get_msg: Callable[[str], str]) -> None:
+    def __init__(self, size: int, allow_duplicate: bool, get_msg: Callable[[str], str], history_size: int = 0, spill_size: int = 0) -> None:
         self._queue: List[Track] = []
         self._position: int = 0
         self._size: int = size
         self._repeat: LoopTypeCycle = LoopTypeCycle()
         self._repeat_position: int = 0
         self._allow_duplicate: bool = allow_duplicate
+        self._identities: Dict[str, int] = {}
+        self._length_tree: Optional[LengthTree] = None
+        self._unshuffled: Dict[str, List[Track]] = {}
+
+        # Played tracks beyond history_size are kept as (track_id, requester) in a ring.
+        self._history_size: int = history_size
+        self._spilled: Deque[Tuple[str, Member]] = deque(maxlen=spill_size)
+        self._dropped: int = 0
+        # Set when trimming or restoring the history moved every index, cleared by pop_window_moved().
+        self._window_moved: bool = False
 
         self.get_msg = get_msg
 
+    def __contains__(self, track: Track) -> bool:
+        return track.identity in self._identities
+
+    def _track_added(self, track: Track) -> None:
+        self._identities[track.identity] = self._identities.get(track.identity, 0) + 1
+
+    def _track_removed(self, track: Track) -> None:
+        count = self._identities.get(track.identity, 0) - 1
+        if count > 0:
+            self._identities[track.identity] = count
+        else:
+            self._identities.pop(track.identity, None)
+
+    def _lengths(self) -> LengthTree:
+        if self._length_tree is None:
+            self._length_tree = LengthTree(self._queue)
+        return self._length_tree
+
     def get(self) -> Optional[Track]:
         track = None
         try:
@@ -70,19 +176,90 @@ class Queue:
                 self._position += 1
         except:
             if self._repeat.mode == LoopType.QUEUE:
+                # Bring the spilled history back, so the loop starts over from the first played track.
+                # The player restores it in chunks through restore_spilled() before calling get().
+                if self._spilled:
+                    self._restore_history(len(self._spilled))
+                self._repeat_position = max(self._repeat_position, 0)
+
                 try:
                     track = self._queue[self._repeat_position]
                     self._position = self._repeat_position + 1
                 except IndexError:
                     self._repeat.set_mode(LoopType.OFF)
 
+        self._trim_history()
         return track
 
+    def _trim_history(self) -> None:
+        if not self._history_size or self._repeat.mode == LoopType.QUEUE:
+            return
+
+        overflow = self._position - 1 - self._history_size
+        if overflow <= 0:
+            return
+
+        for track in self._queue[:overflow]:
+            self._track_removed(track)
+            if len(self._spilled) == self._spilled.maxlen:
+                self._dropped += 1
+
+            # The track info is shared with other tracks, only the track object itself is freed.
+            self._spilled.append((track.track_id, track.requester))
+
+        if self._length_tree is not None:
+            self._length_tree.drop_front(self._queue[:overflow])
+            if self._length_tree._offset > len(self._queue):
+                self._length_tree = None
+
+        del self._queue[:overflow]
+        self._window_moved = True
+        self._position -= overflow
+        # Goes below zero when the loop start was spilled, restoring the history brings it back.
+        self._repeat_position -= overflow
+
+    def _restore_history(self, count: int) -> int:
+        """Moves the last `count` spilled tracks back in front of the history.
+           Returns how many were restored, entries that can't be decoded are dropped.
+        """
+        entries = [self._spilled.pop() for _ in range(count)]
+        entries.reverse()
+        tracks = []
+        for track_id, requester in entries:
+            try:
+                tracks.append(Track(track_id=track_id, info=decode(track_id), requester=requester))
+            except Exception:
+                self._dropped += 1
+
+        self._queue[0:0] = tracks
+        self._length_tree = None
+        for track in tracks:
+            self._track_added(track)
+
+        self._position += len(tracks)
+        self._repeat_position += len(tracks)
+        self._window_moved = self._window_moved or bool(tracks)
+        return len(tracks)
+
+    async def restore_spilled(self, chunk_size: int = 100) -> None:
+        """Restores the whole spilled history in chunks, yielding to the event loop between them."""
+        while self._spilled:
+            self._restore_history(min(chunk_size, len(self._spilled)))
+            await asyncio.sleep(0)
+
+    def pop_window_moved(self) -> bool:
+        """Returns whether the history was trimmed or restored since the last call."""
+        moved, self._window_moved = self._window_moved, False
+        return moved
+
     def put(self, item: Track) -> int:
         if self.count >= self._size:
             raise QueueFull(self.get_msg("voicelinkQueueFull").format(self._size))
 
         self._queue.append(item)
+        self._track_added(item)
+        if self._length_tree is not None:
+            self._length_tree.append(item)
         return self.count
 
     def put_at_front(self, item: Track) -> int:
@@ -90,13 +267,38 @@ class Queue:
             raise QueueFull(self.get_msg("voicelinkQueueFull").format(self._size))
 
         self._queue.insert(self._position, item)
+        self._track_added(item)
+        self._length_tree = None
         return 1
 
     def put_at_index(self, index: int, item: Track) -> None:
         if self.count >= self._size:
             raise QueueFull(self.get_msg("voicelinkQueueFull").format(self._size))
 
-        return self._queue.insert(self._position - 1 + index, item)
+        self._queue.insert(self._position - 1 + index, item)
+        self._track_added(item)
+        self._length_tree = None
+
+    def put_many(self, items: List[Track], at_front: bool = False) -> List[Track]:
+        """Adds the tracks in a single splice, dropping any that do not fit in the queue.
+           Returns the tracks that were added.
+        """
+        space = self._size - self.count
+        if space <= 0:
+            raise QueueFull(self.get_msg("voicelinkQueueFull").format(self._size))
+
+        items = items[:space]
+        index = self._position if at_front else len(self._queue)
+        self._queue[index:index] = items
+        for item in items:
+            self._track_added(item)
+            if self._length_tree is not None and not at_front:
+                self._length_tree.append(item)
+
+        if at_front:
+            self._length_tree = None
+
+        return items
 
     def skipto(self, index: int) -> None:
         if not 0 < index <= self.count:
@@ -106,29 +308,107 @@ class Queue:
 
     def backto(self, index: int) -> None:
         if not self._position - index >= 0:
-            raise OutofList(self.get_msg("voicelinkOutofList"))
-        else:
-            self._position -= index
+            missing = index - self._position
+            if missing > len(self._spilled):
+                raise OutofList(self.get_msg("voicelinkOutofList"))
+
+            if self._restore_history(missing) < missing:
+                raise OutofList(self.get_msg("voicelinkOutofList"))
+
+        self._position -= index
 
     def history_clear(self, is_playing: bool) -> None:
-        self._queue[:self._position - 1 if is_playing else self._position] = []
+        end = self._position - 1 if is_playing else self._position
+        for track in self._queue[:end]:
+            self._track_removed(track)
+
+        if self._length_tree is not None and end >= 0:
+            self._length_tree.drop_front(self._queue[:end])
+        else:
+            self._length_tree = None
+
+        self._queue[:end] = []
         self._position = 1 if is_playing else 0
+        self._spilled.clear()
+        self._unshuffled.pop("history", None)
 
     def clear(self) -> None:
+        for track in self.iter_tracks():
+            self._track_removed(track)
+
         del self._queue[self._position:]
+        if self._length_tree is not None:
+            self._length_tree.truncate(len(self._queue))
+        self._unshuffled.pop("queue", None)
 
     def replace(self, queue_type: str, replacement: list) -> None:
+        self._unshuffled.pop(queue_type, None)
         if queue_type == "queue":
             self.clear()
             self._queue += replacement
         elif queue_type == "history":
+            for track in self._queue[:self._position]:
+                self._track_removed(track)
             self._queue[:self._position] = replacement
+            self._position = len(replacement)
+            self._length_tree = None
+            self._spilled.clear()
+        else:
+            return
+
+        for track in replacement:
+            self._track_added(track)
+            if self._length_tree is not None:
+                self._length_tree.append(track)
+
+    def _region(self, queue_type: str) -> Tuple[int, int]:
+        if queue_type == "history":
+            return 0, max(self._position - 1, 0)
+        return self._position, len(self._queue)
+
+    def _permute(self, start: int, stop: int, permutation: List[int]) -> None:
+        region = self._queue[start:stop]
+        self._queue[start:stop] = [region[index] for index in permutation]
+        self._length_tree = None
+
+    def shuffle(self, queue_type: str, seed: Optional[int] = None) -> List[int]:
+        """Shuffles the upcoming tracks or the history in place and returns the permutation,
+           the track now at index i of the region was at permutation[i] before.
+           The order before the first shuffle is kept so it can be restored with unshuffle.
+        """
+        start, stop = self._region(queue_type)
+        permutation = list(range(stop - start))
+        Random(seed).shuffle(permutation)
+
+        self._unshuffled.setdefault(queue_type, self._queue[start:stop])
+        self._permute(start, stop, permutation)
+        return permutation
+
+    def unshuffle(self, queue_type: str) -> Optional[List[int]]:
+        """Restores the order from before the tracks were shuffled and returns the permutation applied.
+           Tracks added after the shuffle keep their order at the end. Returns None if there is nothing to restore.
+        """
+        original = self._unshuffled.pop(queue_type, None)
+        if original is None:
+            return None
+
+        start, stop = self._region(queue_type)
+        ranks = {id(track): rank for rank, track in enumerate(original)}
+        permutation = sorted(range(stop - start), key=lambda index: ranks.get(id(self._queue[start + index]), len(ranks)))
+        self._permute(start, stop, permutation)
+        return permutation
 
     def swap(self, track_index1: int, track_index2: int) -> Tuple[Track, Track]:
         try:
-            adjusted_position = self._position - 1
-            self._queue[adjusted_position + track_index1], self._queue[adjusted_position + track_index2] = self._queue[adjusted_position + track_index2], self._queue[adjusted_position + track_index1]
-            return self._queue[adjusted_position + track_index1], self._queue[adjusted_position + track_index2]
+            index1, index2 = self._position - 1 + track_index1, self._position - 1 + track_index2
+            self._queue[index1], self._queue[index2] = self._queue[index2], self._queue[index1]
+            if self._length_tree is not None:
+                if index1 >= 0 and index2 >= 0:
+                    self._length_tree.replace(index1, self._queue[index2], self._queue[index1])
+                    self._length_tree.replace(index2, self._queue[index1], self._queue[index2])
+                else:
+                    self._length_tree = None
+            return self._queue[index1], self._queue[index2]
         except IndexError:
             raise OutofList(self.get_msg("voicelinkOutofList"))
 
@@ -137,9 +417,9 @@ class Queue:
             raise OutofList(self.get_msg("voicelinkOutofList"))
 
         try:
-            item = self._queue[self._position + target - 1]
-            self._queue.remove(item)
-            self.put_at_index(to, item)
+            item = self._queue.pop(self._position + target - 1)
+            self._queue.insert(self._position - 1 + to, item)
+            self._length_tree = None
             return item
         except:
             raise OutofList(self.get_msg("voicelinkOutofList"))
@@ -154,13 +434,21 @@ class Queue:
             index, index2 = index2, index
 
         try:
-            removed_tracks: Dict[str, Track] = {}
-            for i, track in enumerate(self._queue[pos + index: pos + index2 + 1]):
+            start, stop = pos + index, pos + index2 + 1
+            removed_tracks: Dict[int, Track] = {}
+            kept_tracks: List[Track] = []
+            for i, track in enumerate(self._queue[start:stop]):
                 if member and track.requester != member:
+                    kept_tracks.append(track)
                     continue
-            
-                self._queue.remove(track)
-                removed_tracks[pos + index + i] = track
+
+                removed_tracks[start + i] = track
+
+            if removed_tracks:
+                self._queue[start:stop] = kept_tracks
+                self._length_tree = None
+                for track in removed_tracks.values():
+                    self._track_removed(track)
 
             return removed_tracks
         except:
@@ -176,43 +464,259 @@ class Queue:
             return self._queue[self._position - 1:]
         return self._queue[self._position:]
 
+    def iter_history(self, start: int = 0, stop: Optional[int] = None, incTrack: bool = False, reverse: bool = False) -> Iterator[Track]:
+        """Yields the history tracks in [start, stop) without copying the queue.
+           With reverse=True the window is counted from the most recent track.
+        """
+        end = max(self._position if incTrack else self._position - 1, 0)
+        stop = end if stop is None else min(stop, end)
+        indexes = range(end - 1 - start, end - 1 - stop, -1) if reverse else range(start, stop)
+        for index in indexes:
+            yield self._queue[index]
+
+    def iter_tracks(self, start: int = 0, stop: Optional[int] = None, incTrack: bool = False) -> Iterator[Track]:
+        """Yields the upcoming tracks in [start, stop) without copying the queue."""
+        base = max(self._position - 1 if incTrack else self._position, 0)
+        end = len(self._queue) if stop is None else min(base + stop, len(self._queue))
+        for index in range(base + start, end):
+            yield self._queue[index]
+
+    def tracks_length(self, start: int = 0, stop: Optional[int] = None, incTrack: bool = False) -> float:
+        """Returns the total length of the upcoming tracks in [start, stop), or inf if one of them is a stream."""
+        base = max(self._position - 1 if incTrack else self._position, 0)
+        end = len(self._queue) if stop is None else min(base + stop, len(self._queue))
+        return self._lengths().sum(base + start, end)
+
+    def history_length(self, incTrack: bool = False) -> float:
+        """Returns the total length of the history tracks, or inf if one of them is a stream."""
+        return self._lengths().sum(0, max(self._position if incTrack else self._position - 1, 0))
+
+    def time_until(self, index: int) -> float:
+        """Returns how long the upcoming tracks before the given queue index will play for."""
+        return self.tracks_length(0, index - 1)
+
     @property
     def count(self) -> int:
-        return len(self._queue[self._position:])
+        return max(len(self._queue) - self._position, 0)
+
+    @property
+    def space(self) -> int:
+        """How many more tracks the queue can take."""
+        return max(self._size - self.count, 0)
+
+    @property
+    def history_count(self) -> int:
+        return max(min(self._position - 1, len(self._queue)), 0)
     
+    def memory_report(self) -> Dict[str, int]:
+        """Returns how many tracks the queue holds and how many played tracks were spilled or dropped."""
+        return {
+            "tracks": len(self._queue),
+            "history": self.history_count,
+            "spilled": len(self._spilled),
+            "dropped": self._dropped
+        }
+
+    @property
+    def loops_back(self) -> bool:
+        """Whether the next get() wraps around to the start of a looped queue."""
+        return self._repeat.mode == LoopType.QUEUE and self._position >= len(self._queue)
+
     @property
     def repeat(self) -> str:
         return self._repeat.mode.name.capitalize()
 
     @property
     def is_empty(self) -> bool:
-        try:
-            self._queue[self._position]
-        except:
-            return True
-        return False
+        return self._position >= len(self._queue)
 
 class FairQueue(Queue):
-    def __init__(self, size: int, allow_duplicate: bool, get_msg) -> None:
-        super().__init__(size, allow_duplicate, get_msg)
-        self._set = set()
+    """A queue that interleaves the tracks of different requesters.
+
+       The upcoming tracks (current track included) are kept in rounds: every round
+       holds at most one track per requester, ordered by the rotation. A requester's
+       next track goes into the round after their last one, so the insert position is
+       found from the per-requester counts in O(requesters) instead of a scan in Python.
+       The tracks still live in the flat list shared with Queue, so the insert itself
+       is a list.insert, O(n) memmove. Any other change to the order drops the index,
+       and the next put rebuilds it with an O(n) pass over the upcoming tracks.
+    """
+
+    def __init__(self, size: int, allow_duplicate: bool, get_msg, history_size: int = 0, spill_size: int = 0) -> None:
+        super().__init__(size, allow_duplicate, get_msg, history_size, spill_size)
+        self._rotation: Deque[Any] = deque()
+        self._counts: Dict[Any, int] = {}
+        self._synced: bool = False
+
+    @staticmethod
+    def _requester_key(track: Track) -> Any:
+        return track.requester.id if track.requester else None
+
+    def _invalidate(self) -> None:
+        self._synced = False
+
+    def _sync(self) -> bool:
+        """Rebuilds the rotation index, returns False if the list is not in rounds."""
+        keys = [self._requester_key(self._queue[index]) for index in range(max(self._position - 1, 0), len(self._queue))]
+        rotation: Deque[Any] = deque()
+        counts: Dict[Any, int] = {}
+        for key in keys:
+            count = counts.get(key, 0)
+            if not count:
+                rotation.append(key)
+            counts[key] = count + 1
+
+        index, round = 0, 0
+        active = list(rotation)
+        while active:
+            for key in active:
+                if keys[index] != key:
+                    return False
+                index += 1
+            round += 1
+            active = [key for key in active if counts[key] > round]
+
+        self._rotation, self._counts, self._synced = rotation, counts, True
+        return True
+
+    def _scan_index(self, key: Any) -> int:
+        base = max(self._position - 1, 0)
+        last_index = len(self._queue)
+        while last_index > base and self._requester_key(self._queue[last_index - 1]) != key:
+            last_index -= 1
+
+        requesters = set()
+        while last_index < len(self._queue):
+            requester = self._requester_key(self._queue[last_index])
+            if requester in requesters:
+                break
+            requesters.add(requester)
+            last_index += 1
+
+        return last_index - base
+
+    def _rotation_index(self, key: Any) -> int:
+        round = self._counts.get(key, 0)
+        index, before = 0, True
+        for requester in self._rotation:
+            count = self._counts[requester]
+            if requester == key:
+                before = False
+            elif before and count > round:
+                index += 1
+            index += min(count, round)
+
+        return index
+
+    def get(self) -> Optional[Track]:
+        # Trimming the history moves the cursor, so compare the number of tracks left instead.
+        position, remaining = self._position, len(self._queue) - self._position
+        track = super().get()
+
+        if self._synced and len(self._queue) - self._position != remaining:
+            if len(self._queue) - self._position != remaining - 1 or not self._rotation:
+                self._invalidate()
+
+            elif position >= 1:
+                key = self._rotation.popleft()
+                self._counts[key] -= 1
+                if self._counts[key]:
+                    self._rotation.append(key)
+                else:
+                    del self._counts[key]
+
+                if not self._rotation or self._rotation[0] != self._requester_key(track):
+                    self._invalidate()
+
+        return track
 
     def put(self, item: Track) -> int:
         if len(self._queue) >= self._size:
             raise QueueFull(self.get_msg("voicelinkQueueFull").format(self._size))
 
-        tracks = self.tracks(incTrack=True)
-        lastIndex = len(tracks)
-        for track in reversed(tracks):
-            if track.requester == item.requester:
-                break
-            lastIndex -= 1
-        self._set.clear()
-        for track in tracks[lastIndex:]:
-            if track.requester in self._set:
-                break
-            lastIndex += 1
-            self._set.add(track.requester)
+        key = self._requester_key(item)
+        if self._synced or self._sync():
+            index = self._rotation_index(key)
+            if key not in self._counts:
+                self._rotation.append(key)
+                self._counts[key] = 0
+            self._counts[key] += 1
+        else:
+            index = self._scan_index(key)
+
+        position = max(self._position - 1, 0) + index
+        self._queue.insert(position, item)
+        self._track_added(item)
+        if self._length_tree is not None:
+            if position == len(self._queue) - 1:
+                self._length_tree.append(item)
+            else:
+                self._length_tree = None
+        return index
+
+    def put_many(self, items: List[Track], at_front: bool = False) -> List[Track]:
+        if at_front:
+            self._invalidate()
+            return super().put_many(items, at_front)
+
+        if not self.space:
+            raise QueueFull(self.get_msg("voicelinkQueueFull").format(self._size))
+
+        items = items[:self.space]
+        for item in items:
+            self.put(item)
+
+        return items
+
+    def put_at_front(self, item: Track) -> int:
+        self._invalidate()
+        return super().put_at_front(item)
+
+    @property
+    def space(self) -> int:
+        """How many more tracks the queue can take, the history counts towards the size here."""
+        return max(self._size - len(self._queue), 0)
 
-        self.put_at_index(lastIndex, item)
-        return lastIndex
+    def put_at_index(self, index: int, item: Track) -> None:
+        self._invalidate()
+        return super().put_at_index(index, item)
+
+    def skipto(self, index: int) -> None:
+        self._invalidate()
+        return super().skipto(index)
+
+    def backto(self, index: int) -> None:
+        self._invalidate()
+        return super().backto(index)
+
+    def history_clear(self, is_playing: bool) -> None:
+        self._invalidate()
+        return super().history_clear(is_playing)
+
+    def clear(self) -> None:
+        self._invalidate()
+        return super().clear()
+
+    def replace(self, queue_type: str, replacement: list) -> None:
+        self._invalidate()
+        return super().replace(queue_type, replacement)
+
+    def shuffle(self, queue_type: str, seed: Optional[int] = None) -> List[int]:
+        self._invalidate()
+        return super().shuffle(queue_type, seed)
+
+    def unshuffle(self, queue_type: str) -> Optional[List[int]]:
+        self._invalidate()
+        return super().unshuffle(queue_type)
+
+    def swap(self, track_index1: int, track_index2: int) -> Tuple[Track, Track]:
+        self._invalidate()
+        return super().swap(track_index1, track_index2)
+
+    def move(self, target: int, to: int) -> Optional[Track]:
+        self._invalidate()
+        return super().move(target, to)
+
+    def remove(self, index: int, index2: int = None, member: Member = None) -> Dict[int, Track]:
+        self._invalidate()
+        return super().remove(index, index2, member)
@@ -21,9 +21,16 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import asyncio
+import heapq
+import itertools
 import time
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, TYPE_CHECKING, Any
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Iterator, List, Optional, Dict, TYPE_CHECKING, Any, Tuple
+
+from .enums import RequestPriority
 
 if TYPE_CHECKING:
     from .pool import Node
@@ -117,4 +124,154 @@ class LoadBalance(YTRatelimit):
 
 STRATEGY = {
     "LoadBalance": LoadBalance
-}
\ No newline at end of file
+}
+
+# The priority used by requests that don't pass one, see RequestScheduler.priority().
+_priority: ContextVar[Optional[RequestPriority]] = ContextVar("request_priority", default=None)
+
+class TokenBucket:
+    """Allows `rate` requests per second on average, with bursts of up to `burst` requests."""
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate: float = rate
+        self.burst: float = burst
+        self.tokens: float = burst
+        self.updated_at: float = time.monotonic()
+
+    def reserve(self) -> float:
+        """Takes a token and returns how many seconds the caller has to wait for it."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.tokens -= 1
+        return max(-self.tokens / self.rate, 0.0)
+
+    def refund(self) -> None:
+        """Gives back a reserved token that wasn't used."""
+        self.tokens = min(self.burst, self.tokens + 1)
+
+class RequestScheduler:
+    """
+    Schedules the REST requests of a node by priority.
+    At most `max_concurrency` requests run at once, and bulk requests only start while fewer
+    than `bulk_concurrency` are running, so the remaining slots are kept for interactive ones.
+    Requests to a source with a token bucket wait for a token before queueing for a slot.
+    """
+    def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
+        config = config or {}
+        self.max_concurrency: int = max(config.get("max_concurrency", 8), 1)
+        self.bulk_concurrency: int = min(max(config.get("bulk_concurrency", self.max_concurrency // 2), 1), self.max_concurrency)
+        self.buckets: Dict[str, TokenBucket] = {
+            source: TokenBucket(bucket.get("rate", 5), bucket.get("burst", 10))
+            for source, bucket in config.get("sources", {}).items()
+        }
+
+        self._active: int = 0
+        self._waiters: List[Tuple[int, int, RequestPriority, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+        # priority -> [requests, total delay, max delay]
+        self._delays: Dict[RequestPriority, List[float]] = {priority: [0, 0.0, 0.0] for priority in RequestPriority}
+
+    @staticmethod
+    @contextmanager
+    def priority(priority: RequestPriority) -> Iterator[None]:
+        """Sets the default priority of the requests sent inside the block."""
+        token = _priority.set(priority)
+        try:
+            yield
+        finally:
+            _priority.reset(token)
+
+    @staticmethod
+    def current_priority(default: RequestPriority = RequestPriority.NORMAL) -> RequestPriority:
+        return _priority.get() or default
+
+    def _limit(self, priority: RequestPriority) -> int:
+        return self.bulk_concurrency if priority == RequestPriority.BULK else self.max_concurrency
+
+    def _wake(self) -> None:
+        while self._waiters:
+            _, _, priority, waiter = self._waiters[0]
+            if waiter.done():
+                heapq.heappop(self._waiters)
+                continue
+
+            # The first waiter has the highest priority, if it can't start nothing can.
+            if self._active >= self._limit(priority):
+                break
+
+            heapq.heappop(self._waiters)
+            self._active += 1
+            waiter.set_result(None)
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self, priority: RequestPriority, source: Optional[str] = None) -> AsyncIterator[None]:
+        """Waits for the source's token bucket and a free slot, then holds the slot for the block."""
+        started_at = time.monotonic()
+        bucket = self.buckets.get(source)
+        try:
+            if bucket:
+                delay = bucket.reserve()
+                if delay:
+                    await asyncio.sleep(delay)
+
+            if not self._waiters and self._active < self._limit(priority):
+                self._active += 1
+            else:
+                waiter = asyncio.get_running_loop().create_future()
+                heapq.heappush(self._waiters, (priority.value, next(self._counter), priority, waiter))
+                self._wake()
+                try:
+                    await waiter
+                except asyncio.CancelledError:
+                    # The slot may have been handed over right before the cancellation.
+                    if waiter.done() and not waiter.cancelled():
+                        self._release()
+                    raise
+        except asyncio.CancelledError:
+            # The request was never sent, so its token goes back to the bucket.
+            if bucket:
+                bucket.refund()
+            raise
+
+        self._record(priority, time.monotonic() - started_at)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _record(self, priority: RequestPriority, delay: float) -> None:
+        stats = self._delays[priority]
+        stats[0] += 1
+        stats[1] += delay
+        stats[2] = max(stats[2], delay)
+
+    @property
+    def active(self) -> int:
+        """Property which returns the number of running requests."""
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        """Property which returns the number of requests waiting for a slot."""
+        return sum(not waiter.done() for *_, waiter in self._waiters)
+
+    def average_delay(self, priority: RequestPriority = RequestPriority.INTERACTIVE) -> float:
+        """Returns the average queueing delay in seconds of the priority class."""
+        requests, total, _ = self._delays[priority]
+        return total / requests if requests else 0.0
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Returns the number of requests and the average and max queueing delay (in ms) of each priority class."""
+        return {
+            str(priority): {
+                "requests": requests,
+                "average_delay": round(total / requests * 1000, 2) if requests else 0.0,
+                "max_delay": round(longest * 1000, 2)
+            }
+            for priority, (requests, total, longest) in self._delays.items()
+        }
@@ -22,15 +22,21 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import re
 import struct
 
-from io import BytesIO
 from base64 import b64decode, b64encode
-from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Final
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Final
 
 V2_KEYSET = {'title', 'author', 'length', 'identifier', 'isStream', 'uri', 'sourceName', 'position'}
 V3_KEYSET = V2_KEYSET | {'artworkUrl', 'isrc'}
 
+# Number of decoded track ids kept by the decode cache.
+DECODE_CACHE_SIZE = 2048
+# Number of encoded track ids kept by the encode cache.
+ENCODE_CACHE_SIZE = 2048
+
 class _MissingObj:
     __slots__ = ()
 
@@ -39,19 +45,28 @@ class _MissingObj:
 
 MISSING: Any = _MissingObj()
 
+_UNSIGNED_BYTE: Final[struct.Struct] = struct.Struct('B')
+_UNSIGNED_SHORT: Final[struct.Struct] = struct.Struct('>H')
+_INT: Final[struct.Struct] = struct.Struct('>i')
+_LONG: Final[struct.Struct] = struct.Struct('>Q')
+
+# Lead bytes of 4-byte UTF-8 sequences, which modified UTF-8 never produces.
+_UTF8_FOUR_BYTE_LEAD: Final[re.Pattern] = re.compile(rb'[\xf0-\xff]')
+
 class DataReader:
-    __slots__ = ('_buf', '_mark')
+    __slots__ = ('_buf', '_pos', '_mark')
 
     def __init__(self, base64_str: str):
-        self._buf: Final[BytesIO] = BytesIO(b64decode(base64_str))
+        self._buf: Final[memoryview] = memoryview(b64decode(base64_str))
+        self._pos: int = 0
         self._mark: Optional[int] = None
 
     @property
     def remaining(self) -> int:
-        return self._buf.getbuffer().nbytes - self._buf.tell()
+        return len(self._buf) - self._pos
 
     def mark(self) -> None:
-        self._mark = self._buf.tell()
+        self._mark = self._pos
 
     def rewind(self) -> None:
         if self._mark is None or not isinstance(self._mark, int):
@@ -60,30 +75,33 @@ class DataReader:
         if self._mark < 0:
             raise IOError('Cannot rewind buffer to a negative position!')
 
-        self._buf.seek(self._mark)
+        self._pos = self._mark
         self._mark = None
 
     def _read(self, count: int) -> bytes:
-        return self._buf.read(count)
+        data = self._buf[self._pos:self._pos + count].tobytes()
+        self._pos += len(data)
+        return data
+
+    def _unpack(self, fmt: struct.Struct) -> Any:
+        result, = fmt.unpack_from(self._buf, self._pos)
+        self._pos += fmt.size
+        return result
 
     def read_byte(self) -> bytes:
         return self._read(1)
 
     def read_boolean(self) -> bool:
-        result, = struct.unpack('B', self.read_byte())
-        return result != 0
+        return self._unpack(_UNSIGNED_BYTE) != 0
 
     def read_unsigned_short(self) -> int:
-        result, = struct.unpack('>H', self._read(2))
-        return result
+        return self._unpack(_UNSIGNED_SHORT)
 
     def read_int(self) -> int:
-        result, = struct.unpack('>i', self._read(4))
-        return result
+        return self._unpack(_INT)
 
     def read_long(self) -> int:
-        result, = struct.unpack('>Q', self._read(8))
-        return result
+        return self._unpack(_LONG)
 
     def read_nullable_utf(self, utfm: bool = False) -> Optional[str]:
         exists = self.read_boolean()
@@ -106,29 +124,26 @@ class DataWriter:
     __slots__ = ('_buf',)
 
     def __init__(self):
-        self._buf: Final[BytesIO] = BytesIO()
+        # The first 4 bytes are reserved for the flags header, which finish() fills in place.
+        self._buf: Final[bytearray] = bytearray(_INT.size)
 
     def _write(self, data):
-        self._buf.write(data)
+        self._buf += data
 
     def write_byte(self, byte):
-        self._buf.write(byte)
+        self._buf += byte
 
     def write_boolean(self, boolean: bool):
-        enc = struct.pack('B', 1 if boolean else 0)
-        self.write_byte(enc)
+        self._buf.append(1 if boolean else 0)
 
     def write_unsigned_short(self, short: int):
-        enc = struct.pack('>H', short)
-        self._write(enc)
+        self._write(_UNSIGNED_SHORT.pack(short))
 
     def write_int(self, integer: int):
-        enc = struct.pack('>i', integer)
-        self._write(enc)
+        self._write(_INT.pack(integer))
 
     def write_long(self, long_value: int):
-        enc = struct.pack('>Q', long_value)
-        self._write(enc)
+        self._write(_LONG.pack(long_value))
 
     def write_nullable_utf(self, utf_string: Optional[str]):
         self.write_boolean(bool(utf_string))
@@ -147,18 +162,10 @@ class DataWriter:
         self._write(utf)
 
     def finish(self) -> bytes:
-        with BytesIO() as track_buf:
-            byte_len = self._buf.getbuffer().nbytes
-            flags = byte_len | (1 << 30)
-            enc_flags = struct.pack('>i', flags)
-            track_buf.write(enc_flags)
-
-            self._buf.seek(0)
-            track_buf.write(self._buf.read())
-            self._buf.close()
-
-            track_buf.seek(0)
-            return track_buf.read()
+        byte_len = len(self._buf) - _INT.size
+        flags = byte_len | (1 << 30)
+        _INT.pack_into(self._buf, 0, flags)
+        return bytes(self._buf)
 
 def decode_probe_info(reader: DataReader) -> Mapping[str, Any]:
     probe_info = reader.read_utf().decode()
@@ -193,6 +200,18 @@ DEFAULT_DECODER_MAPPING: Dict[str, Callable[[DataReader], Mapping[str, Any]]] =
 }
 
 def read_utfm(utf_len: int, utf_bytes: bytes) -> str:
+    # Modified UTF-8 only differs from UTF-8 for NUL and supplementary characters,
+    # which the strict UTF-8 codec rejects, so anything it accepts decodes the same.
+    if len(utf_bytes) == utf_len:
+        if utf_bytes.isascii():
+            return utf_bytes.decode('ascii')
+
+        if not _UTF8_FOUR_BYTE_LEAD.search(utf_bytes):
+            try:
+                return utf_bytes.decode('utf-8')
+            except UnicodeDecodeError:
+                pass
+
     chars = []
     count = 0
 
@@ -256,16 +275,38 @@ def _write_track_common(track: Dict[str, Any], writer: DataWriter):
     writer.write_boolean(track['isStream'])
     writer.write_nullable_utf(track['uri'])
 
-def decode(
-    track: str,
-    source_decoders: Mapping[str, Callable[[DataReader], Mapping[str, Any]]] = MISSING
-) -> dict:
+def _read_header(reader: DataReader) -> dict:
+    flags = (reader.read_int() & 0xC0000000) >> 30
+    version, = struct.unpack('B', reader.read_byte()) if flags & 1 != 0 else (1,)
 
-    decoders = DEFAULT_DECODER_MAPPING.copy()
+    title, author, length, identifier, is_stream, uri = _read_track_common(reader)
+    header = {
+        'title': title,
+        'author': author,
+        'length': length,
+        'identifier': identifier,
+        'isStream': is_stream,
+        'uri': uri
+    }
+
+    if version == 3:
+        header['artworkUrl'] = reader.read_nullable_utf()
+        header['isrc'] = reader.read_nullable_utf()
+
+    header['sourceName'] = reader.read_utf().decode()
+    return header
+
+@lru_cache(maxsize=DECODE_CACHE_SIZE)
+def _decode_header_cached(track: str) -> dict:
+    return _read_header(DataReader(track))
 
-    if source_decoders is not MISSING:
-        decoders.update(source_decoders)
+def decode_header(track: str) -> dict:
+    """Decodes only the common fields of a track id (title, author, length, identifier, isStream,
+       uri, artworkUrl, isrc and sourceName), skipping the source specific fields and the position.
+    """
+    return dict(_decode_header_cached(track))
 
+def _decode(track: str, decoders: Mapping[str, Callable[[DataReader], Mapping[str, Any]]]) -> dict:
     reader = DataReader(track)
 
     flags = (reader.read_int() & 0xC0000000) >> 30
@@ -299,12 +340,44 @@ def decode(
         **extra_fields
     }
 
-def encode(
-    track: Dict[str, Any],
+@lru_cache(maxsize=DECODE_CACHE_SIZE)
+def _decode_cached(track: str) -> dict:
+    return _decode(track, DEFAULT_DECODER_MAPPING)
+
+def decode(
+    track: str,
+    source_decoders: Mapping[str, Callable[[DataReader], Mapping[str, Any]]] = MISSING
+) -> dict:
+    """Decodes a base64 track id. Results for the default decoders are memoized,
+       and each call returns its own copy of the info dict.
+    """
+    if source_decoders is MISSING:
+        return dict(_decode_cached(track))
+
+    decoders = DEFAULT_DECODER_MAPPING.copy()
+    decoders.update(source_decoders)
+    return _decode(track, decoders)
+
+def decode_many(
+    tracks: Iterable[str],
+    source_decoders: Mapping[str, Callable[[DataReader], Mapping[str, Any]]] = MISSING
+) -> List[dict]:
+    """Decodes a batch of track ids, building the decoder table once for the whole batch."""
+    if source_decoders is MISSING:
+        return [dict(_decode_cached(track)) for track in tracks]
+
+    decoders = DEFAULT_DECODER_MAPPING.copy()
+    decoders.update(source_decoders)
+    return [_decode(track, decoders) for track in tracks]
+
+def decode_cache_info():
+    """Returns the hits, misses, maxsize and currsize of the decode cache."""
+    return _decode_cached.cache_info()
+
+def _encode(
+    track: Mapping[str, Any],
     source_encoders: Mapping[str, Callable[[DataWriter, Dict[str, Any]], None]] = MISSING
 ) -> str:
-    assert V3_KEYSET <= track.keys()
-
     writer = DataWriter()
     version = struct.pack('B', 3)
     writer.write_byte(version)
@@ -319,4 +392,28 @@ def encode(
     writer.write_long(track['position'])
 
     enc = writer.finish()
-    return b64encode(enc).decode()
\ No newline at end of file
+    return b64encode(enc).decode()
+
+_V3_FIELDS: Final[Tuple[str, ...]] = ('title', 'author', 'length', 'identifier', 'isStream', 'uri', 'artworkUrl', 'isrc', 'sourceName', 'position')
+
+@lru_cache(maxsize=ENCODE_CACHE_SIZE)
+def _encode_cached(fields: Tuple[Any, ...]) -> str:
+    return _encode(dict(zip(_V3_FIELDS, fields)))
+
+def encode(
+    track: Dict[str, Any],
+    source_encoders: Mapping[str, Callable[[DataWriter, Dict[str, Any]], None]] = MISSING
+) -> str:
+    """Encodes the track info into a base64 track id. Without source encoders the result is
+       memoized on the V3 fields, since those are the only ones written.
+    """
+    assert V3_KEYSET <= track.keys()
+
+    if source_encoders is MISSING:
+        return _encode_cached(tuple(track[field] for field in _V3_FIELDS))
+
+    return _encode(track, source_encoders)
+
+def encode_cache_info():
+    """Returns the hits, misses, maxsize and currsize of the encode cache."""
+    return _encode_cached.cache_info()
\ No newline at end of file
@@ -21,13 +21,20 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import asyncio
+import codecs
+import json
 import random
+import re
 import time
-import socket
 from timeit import default_timer as timer
-from itertools import zip_longest
+from functools import lru_cache
+from collections import deque
 
-from typing import Dict, Optional
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from aiohttp import StreamReader
 
 __all__ = [
     "ExponentialBackoff",
@@ -35,7 +42,11 @@ __all__ = [
     "NodeInfoVersion",
     "NodeInfo",
     "Plugin",
-    "Ping"
+    "LatencySampler",
+    "JSONStream",
+    "extract_domain",
+    "VOICE_REGIONS",
+    "voice_region"
 ]
 
 class ExponentialBackoff:
@@ -108,6 +119,26 @@ class NodeStats:
         self.players_total: int = data.get("players")
         self.uptime: int = data.get("uptime")
 
+        # Frame stats are per minute and missing until the node has played something.
+        frames: Dict = data.get("frameStats") or {}
+        self.frames_sent: int = frames.get("sent", 0)
+        self.frames_nulled: int = frames.get("nulled", 0)
+        self.frames_deficit: int = frames.get("deficit", 0)
+
+    @property
+    def penalty(self) -> float:
+        """The load score used by NodeAlgorithm.BY_LOAD, lower is better.
+           Each playing player costs 1, and CPU load, lost frames and memory use
+           grow exponentially so a node close to its limits is avoided first.
+        """
+        cpu_penalty = 1.05 ** (100 * (self.cpu_system_load or 0)) * 10 - 10
+        # 3000 frames are sent per minute by a player, null frames cost twice as much as deficit ones.
+        deficit_penalty = 1.03 ** (500 * self.frames_deficit / 3000) * 600 - 600
+        null_penalty = (1.03 ** (500 * self.frames_nulled / 3000) * 300 - 300) * 2
+        memory_penalty = 1.05 ** (100 * self.used / self.reservable) * 10 - 10 if self.reservable else 0
+
+        return (self.players_active or 0) + cpu_penalty + deficit_penalty + null_penalty + memory_penalty
+
     def __repr__(self) -> str:
         return f"<Voicelink.NodeStats total_players={self.players_total!r} playing_active={self.players_active!r}>"
 
@@ -142,65 +173,259 @@ class Plugin:
         self.name: str = data.get("name")
         self.version: str = data.get("version")
 
-class Ping:
-    # Thanks to https://github.com/zhengxiaowai/tcping for the nice ping impl
-    def __init__(self, host, port, timeout=5):
-        self.timer = self.Timer()
-
-        self._successed = 0
-        self._failed = 0
-        self._conn_time = None
-        self._host = host
-        self._port = port
-        self._timeout = timeout
-
-    class Socket(object):
-        def __init__(self, family, type_, timeout):
-            s = socket.socket(family, type_)
-            s.settimeout(timeout)
-            self._s = s
-
-        def connect(self, host, port):
-            self._s.connect((host, int(port)))
-
-        def shutdown(self):
-            self._s.shutdown(socket.SHUT_RD)
-
-        def close(self):
-            self._s.close()
-
-
-    class Timer(object):
-        def __init__(self):
-            self._start = 0
-            self._stop = 0
-
-        def start(self):
-            self._start = timer()
+class LatencySampler:
+    """Measures the TCP connect time to a node in the background.
+       Keeps an exponentially weighted moving average and a window of recent samples,
+       so readers get a cached value instead of opening a socket themselves.
+    """
 
-        def stop(self):
-            self._stop = timer()
+    def __init__(self, host: str, port: int, *, interval: float = 30, alpha: float = 0.3, window: int = 60, timeout: float = 5) -> None:
+        self._host: str = host
+        self._port: int = port
+        self._interval: float = interval
+        self._alpha: float = alpha
+        self._timeout: float = timeout
+        self._task: Optional[asyncio.Task] = None
 
-        def cost(self, funcs, args):
-            self.start()
-            for func, arg in zip_longest(funcs, args):
-                if arg:
-                    func(*arg)
-                else:
-                    func()
+        self.average: Optional[float] = None
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.failures: int = 0
 
-            self.stop()
-            return self._stop - self._start
+    def __repr__(self) -> str:
+        return f"<Voicelink.LatencySampler average={self.average!r} samples={len(self.samples)}>"
+
+    def record(self, latency: float) -> None:
+        self.samples.append(latency)
+        self.average = latency if self.average is None else self._alpha * latency + (1 - self._alpha) * self.average
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Returns the nearest-rank percentile of the recent samples in milliseconds."""
+        if not self.samples:
+            return None
+
+        ordered = sorted(self.samples)
+        index = max(int(-(-percent * len(ordered) // 100)) - 1, 0)
+        return ordered[min(index, len(ordered) - 1)]
+
+    async def sample(self) -> Optional[float]:
+        """Opens a connection to the node and records how long it took in milliseconds."""
+        start = timer()
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(self._host, self._port), self._timeout)
+        except (OSError, asyncio.TimeoutError):
+            self.failures += 1
+            return None
+
+        latency = (timer() - start) * 1000
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+        self.record(latency)
+        return latency
+
+    async def _run(self) -> None:
+        while True:
+            await self.sample()
+            await asyncio.sleep(self._interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+class JSONStream:
+    """Decodes a JSON document while it is being downloaded.
+       Objects and arrays are walked one member at a time, so a caller can stop
+       reading (and drop the rest of the body) as soon as it has what it needs.
+    """
 
-    def _create_socket(self, family, type_):
-        return self.Socket(family, type_, self._timeout)
+    _WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+    def __init__(self, content: "StreamReader", chunk_size: int = 65536) -> None:
+        self._content: "StreamReader" = content
+        self._chunk_size: int = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer: str = ""
+        self._index: int = 0
+        self._eof: bool = False
+
+    async def _fill(self) -> bool:
+        if self._eof:
+            return False
+
+        chunk = await self._content.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+
+        self._buffer = self._buffer[self._index:] + self._text_decoder.decode(chunk, final=self._eof)
+        self._index = 0
+        return not self._eof
+
+    async def _peek(self) -> str:
+        while True:
+            self._index = self._WHITESPACE.match(self._buffer, self._index).end()
+            if self._index < len(self._buffer):
+                return self._buffer[self._index]
+
+            if not await self._fill():
+                raise ValueError("Unexpected end of JSON document.")
+
+    async def _expect(self, char: str) -> None:
+        if await self._peek() != char:
+            raise ValueError(f"Expected {char!r} at position {self._index} of the JSON document.")
+        self._index += 1
+
+    async def _separator(self, end: str) -> bool:
+        """Consumes the comma or closing bracket after a member, returns False at the end."""
+        char = await self._peek()
+        self._index += 1
+        if char == end:
+            return False
+        if char != ",":
+            raise ValueError(f"Expected ',' or {end!r} in the JSON document.")
+        return True
+
+    async def value(self) -> Any:
+        """Decodes the next complete value."""
+        await self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._index)
+                # A number at the end of the buffer may continue in the next chunk.
+                if end < len(self._buffer) or self._eof:
+                    self._index = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+
+            await self._fill()
+
+    async def items(self) -> AsyncIterator[str]:
+        """Yields the keys of the next object. Each value must be read before the next key."""
+        await self._expect("{")
+        if await self._peek() == "}":
+            self._index += 1
+            return
+
+        while True:
+            key = await self.value()
+            await self._expect(":")
+            yield key
+            if not await self._separator("}"):
+                return
+
+    async def elements(self) -> AsyncIterator[Any]:
+        """Yields the decoded elements of the next array."""
+        await self._expect("[")
+        if await self._peek() == "]":
+            self._index += 1
+            return
+
+        while True:
+            yield await self.value()
+            if not await self._separator("]"):
+                return
+
+# Second-level public suffixes of the country code domains, from the Public Suffix List.
+# Anything else falls back to the list's default rule, where the suffix is the last label.
+_SECOND_LEVEL_SUFFIXES: Dict[str, Tuple[str, ...]] = {
+    "ar": ("com", "net", "org", "gob", "edu", "int"),
+    "au": ("com", "net", "org", "edu", "gov", "asn", "id"),
+    "br": ("com", "net", "org", "gov", "edu", "art", "blog"),
+    "cn": ("com", "net", "org", "gov", "edu", "ac"),
+    "hk": ("com", "net", "org", "gov", "edu", "idv"),
+    "id": ("co", "or", "net", "web", "ac", "go", "sch", "my", "biz"),
+    "il": ("co", "org", "net", "ac", "gov", "muni"),
+    "in": ("co", "net", "org", "firm", "gen", "ind", "ac", "edu", "gov"),
+    "jp": ("co", "ne", "or", "ac", "go", "ed", "gr", "lg"),
+    "kr": ("co", "ne", "or", "ac", "go", "re", "pe"),
+    "mx": ("com", "net", "org", "gob", "edu"),
+    "my": ("com", "net", "org", "gov", "edu", "name"),
+    "nz": ("co", "net", "org", "ac", "govt", "geek", "school"),
+    "ph": ("com", "net", "org", "gov", "edu"),
+    "sg": ("com", "net", "org", "gov", "edu", "per"),
+    "th": ("co", "in", "or", "net", "ac", "go"),
+    "tr": ("com", "net", "org", "gen", "biz", "web", "av", "gov", "edu"),
+    "tw": ("com", "net", "org", "gov", "edu", "idv"),
+    "uk": ("co", "org", "me", "ltd", "plc", "net", "ac", "gov", "sch"),
+    "vn": ("com", "net", "org", "gov", "edu", "biz", "info"),
+    "za": ("co", "org", "net", "gov", "ac", "web"),
+}
+
+PUBLIC_SUFFIXES: frozenset = frozenset(
+    f"{label}.{tld}" for tld, labels in _SECOND_LEVEL_SUFFIXES.items() for label in labels
+)
+
+# Short link domains, named after the service they redirect to.
+SHORT_DOMAINS: Dict[str, str] = {
+    "youtu.be": "youtube",
+    "spotify.link": "spotify",
+    "spoti.fi": "spotify",
+    "snd.sc": "soundcloud",
+    "apple.co": "apple",
+    "deezer.page.link": "deezer",
+    "dzr.page.link": "deezer"
+}
+
+_HOST_DELIMITERS = re.compile(r"[/?#]")
+
+@lru_cache(maxsize=1024)
+def _host_domain(host: str) -> str:
+    labels = host.split(".")
+    if len(labels) < 2 or host.replace(".", "").isdigit():
+        return host
+
+    for index in range(len(labels) - 1):
+        if (domain := SHORT_DOMAINS.get(".".join(labels[index:]))):
+            return domain
+
+    if len(labels) > 2 and ".".join(labels[-2:]) in PUBLIC_SUFFIXES:
+        return labels[-3]
+
+    return labels[-2]
+
+def extract_domain(url: str) -> str:
+    """Returns the registered domain name of a url without its public suffix,
+       e.g. "youtube" for "https://music.youtube.com/watch?v=...". Short link
+       domains return the service they belong to, "youtube" for "https://youtu.be/...".
+       Works offline, and resolved hostnames are kept in an LRU cache.
+    """
+    host = url.split("://", 1)[-1]
+    host = _HOST_DELIMITERS.split(host, 1)[0].rpartition("@")[2].partition(":")[0]
+    return _host_domain(host.lower().rstrip("."))
+
+# Discord voice regions, and the airport codes their voice servers are named after,
+# mapped to the region group a node can declare.
+VOICE_REGIONS: Dict[str, str] = {
+    **dict.fromkeys(("us-east", "us-central", "us-south", "us-west", "atl", "iad", "ord", "dfw", "lax", "sea", "ewr", "mia", "sjc"), "us"),
+    **dict.fromkeys(("brazil", "gru", "scl"), "southamerica"),
+    **dict.fromkeys(("rotterdam", "europe", "russia", "ams", "fra", "lhr", "cdg", "mad", "waw", "arn", "hel", "mil"), "eu"),
+    **dict.fromkeys(("hongkong", "singapore", "japan", "india", "south-korea", "hkg", "sin", "nrt", "hnd", "bom", "icn"), "asia"),
+    **dict.fromkeys(("sydney", "syd"), "oceania"),
+    **dict.fromkeys(("southafrica", "jnb"), "africa"),
+}
+
+_ENDPOINT_REGION = re.compile(r"^(?:c-)?([a-z]+(?:-[a-z]+)?)\d")
+
+def voice_region(value: Optional[str]) -> Optional[str]:
+    """Returns the region name of a Discord rtc_region or voice server endpoint,
+       e.g. "us-east" for "us-east1234.discord.gg" and "ams" for "c-ams16-3a7c.discord.media:443".
+    """
+    if not value:
+        return None
 
-    def get_ping(self):
-        s = self._create_socket(socket.AF_INET, socket.SOCK_STREAM)
-     
-        cost_time = self.timer.cost(
-            (s.connect, s.shutdown),
-            ((self._host, self._port), None))
-        s_runtime = 1000 * (cost_time)
+    value = str(value).lower()
+    if value in VOICE_REGIONS:
+        return value
 
-        return s_runtime
\ No newline at end of file
+    match = _ENDPOINT_REGION.match(value)
+    return match.group(1) if match else None